@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
+TOKEN_PUNCTUATION = ".,!?;:\"'()[]{}"
+
 
 def now_utc_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
 def tokenize(text: str) -> set[str]:
-    punctuation = ".,!?;:\"'()[]{}"
-    return {token.strip(punctuation) for token in text.lower().split() if token.strip()}
+    # Descriptions repeat words heavily, so dedupe the raw words before stripping.
+    return {token.strip(TOKEN_PUNCTUATION) for token in set(text.lower().split())}
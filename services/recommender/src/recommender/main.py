@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import heapq
 import json
 import logging
 import os
+import queue
 import re
 import secrets
 import sqlite3
@@ -11,13 +14,15 @@ import tempfile
 import threading
 import time
 import uuid
-from contextlib import asynccontextmanager
+from collections.abc import Iterator
+from contextlib import asynccontextmanager, contextmanager
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any, Literal
-from urllib import request as urllib_request
 from urllib.parse import urlsplit
 
+import httpx
 from common.utils import now_utc_iso, tokenize
 from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.concurrency import run_in_threadpool
@@ -25,21 +30,47 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, HttpUrl, model_validator
 
 DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), "operation-battleship", "recommender.sqlite3")
+DEFAULT_SCAN_CONCURRENCY = 8
+SOURCE_FETCH_TIMEOUT_SECONDS = 15
+TOKEN_AUTH_CACHE_TTL_SECONDS = 30.0
+TOKEN_AUTH_CACHE_MAX_ENTRIES = 1024
+ACTIVE_TOKENS_CACHE_TTL_SECONDS = 5.0
+RANKING_CACHE_TTL_SECONDS = 30.0
+RANKING_CACHE_MAX_ENTRIES = 64
 
 SOURCE_INLINE_JSON = "inline_json"
 SOURCE_JSON_URL = "json_url"
 SOURCE_TYPES = (SOURCE_INLINE_JSON, SOURCE_JSON_URL)
 LOGGER = logging.getLogger("battleship.recommender")
+WRITE_BUFFER_FLUSH_INTERVAL_SECONDS = 0.5
+WRITE_BUFFER_FLUSH_BATCH_SIZE = 200
+# Buffered rows take their ids from blocks reserved in sqlite_sequence; the flusher
+# reserves the next block once fewer than half of the current one remain.
+ID_RESERVATION_BLOCK_SIZE = 1000
+POSTINGS_CACHE_MAX_ENTRIES = 16
+READER_POOL_SIZE = 4
+# Filtered list queries and the chunked dedup_key lookup each produce several SQL
+# variants; leave room for them without evicting the fixed hot statements.
+SQLITE_CACHED_STATEMENTS = 256
+# Bump whenever RecommenderRepository gains a column or index so existing databases
+# re-run the _ensure_* migrations on their next connect.
+SCHEMA_VERSION = 2
+RANK_IN_THREADPOOL_MIN_POSTINGS = 50
+SCAN_MARKER_TRANSLATION = str.maketrans("", "", "-:.")
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9\s]+")
 
 
 def normalize_whitespace(text: str) -> str:
+    # Every whitespace character other than " " is non-printable, so printable text
+    # without doubled or edge spaces is already normalized.
+    if text.isprintable() and "  " not in text and text[:1] != " " and text[-1:] != " ":
+        return text
     return " ".join(text.split())
 
 
+@lru_cache(maxsize=4096)
 def normalize_text(text: str) -> str:
-    squashed = normalize_whitespace(text).lower()
-    alnum_only = re.sub(r"[^a-z0-9\s]+", " ", squashed)
-    return normalize_whitespace(alnum_only)
+    return " ".join(NON_ALNUM_PATTERN.sub(" ", text.lower()).split())
 
 
 def normalize_url(url: str | None) -> str:
@@ -57,10 +88,20 @@ def build_dedup_key(
     location: str | None,
     apply_url: str | None,
 ) -> str:
-    normalized_title = normalize_text(title)
-    normalized_company = normalize_text(company or "")
-    normalized_location = normalize_text(location or "")
-    normalized_apply_url = normalize_url(apply_url)
+    return hash_dedup_key(
+        normalize_text(title),
+        normalize_text(company or ""),
+        normalize_text(location or ""),
+        normalize_url(apply_url),
+    )
+
+
+def hash_dedup_key(
+    normalized_title: str,
+    normalized_company: str,
+    normalized_location: str,
+    normalized_apply_url: str,
+) -> str:
     key_input = "|".join(
         [
             normalized_title,
@@ -72,6 +113,7 @@ def build_dedup_key(
     return hashlib.sha1(key_input.encode()).hexdigest()
 
 
+@lru_cache(maxsize=1024)
 def parse_iso_datetime(value: str | None) -> datetime | None:
     if not value:
         return None
@@ -136,6 +178,7 @@ class RecommendRequest(BaseModel):
     resume_text: str = Field(..., min_length=20)
     postings: list[JobPosting] = Field(default_factory=list)
     max_postings: int = Field(default=100, ge=1, le=500)
+    top_k: int | None = Field(default=None, ge=1, le=500)
     profile_id: str | None = None
     preferred_keywords: list[str] = Field(default_factory=list)
     preferred_locations: list[str] = Field(default_factory=list)
@@ -180,15 +223,7 @@ class UpsertPostingsResponse(BaseModel):
     updated: int
 
 
-class StoredPosting(BaseModel):
-    id: str
-    title: str
-    description: str
-    company: str | None = None
-    location: str | None = None
-    apply_url: str | None = None
-    source_id: str | None = None
-    external_id: str | None = None
+class StoredPosting(JobPosting):
     dedup_key: str
     duplicate_hint_count: int
     updated_at: str
@@ -395,6 +430,7 @@ class TokenAuthContext(BaseModel):
     scopes: set[str]
     auth_subject: str
     token_id: str | None = None
+    expires_at: str | None = None
 
 
 class MetricsSnapshot(BaseModel):
@@ -444,11 +480,162 @@ class MetricsStore:
             )
 
 
+class TokenAuthCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = TOKEN_AUTH_CACHE_TTL_SECONDS,
+        max_entries: int = TOKEN_AUTH_CACHE_MAX_ENTRIES,
+        active_tokens_ttl_seconds: float = ACTIVE_TOKENS_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._lock = threading.RLock()
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._active_tokens_ttl_seconds = active_tokens_ttl_seconds
+        self._contexts: dict[str, tuple[float, TokenAuthContext]] = {}
+        self._has_active_tokens: tuple[float, bool] | None = None
+
+    def get_context(self, token_hash: str) -> TokenAuthContext | None:
+        with self._lock:
+            entry = self._contexts.get(token_hash)
+            if entry is None:
+                return None
+            expires_at, context = entry
+            if expires_at <= time.monotonic():
+                del self._contexts[token_hash]
+                return None
+            return context
+
+    def store_context(self, token_hash: str, context: TokenAuthContext) -> None:
+        lifetime = self._ttl_seconds
+        token_expires_at = parse_iso_datetime(context.expires_at)
+        if token_expires_at is not None:
+            if token_expires_at.tzinfo is None:
+                token_expires_at = token_expires_at.replace(tzinfo=UTC)
+            # Never serve a cached context past the token's own expiry.
+            lifetime = min(lifetime, (token_expires_at - datetime.now(UTC)).total_seconds())
+            if lifetime <= 0:
+                return
+        with self._lock:
+            if token_hash not in self._contexts and len(self._contexts) >= self._max_entries:
+                del self._contexts[next(iter(self._contexts))]
+            self._contexts[token_hash] = (time.monotonic() + lifetime, context)
+
+    def discard_context(self, token_hash: str) -> None:
+        with self._lock:
+            self._contexts.pop(token_hash, None)
+
+    def get_has_active_tokens(self) -> bool | None:
+        with self._lock:
+            if self._has_active_tokens is None:
+                return None
+            expires_at, value = self._has_active_tokens
+            if expires_at <= time.monotonic():
+                self._has_active_tokens = None
+                return None
+            return value
+
+    def store_has_active_tokens(self, value: bool) -> None:
+        with self._lock:
+            self._has_active_tokens = (time.monotonic() + self._active_tokens_ttl_seconds, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._contexts.clear()
+            self._has_active_tokens = None
+
+
+class RankingCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = RANKING_CACHE_TTL_SECONDS,
+        max_entries: int = RANKING_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._rankings: dict[tuple[Any, ...], tuple[float, list[RankedRecommendation]]] = {}
+
+    def get(self, key: tuple[Any, ...]) -> list[RankedRecommendation] | None:
+        with self._lock:
+            entry = self._rankings.get(key)
+            if entry is None:
+                return None
+            expires_at, ranked = entry
+            if expires_at <= time.monotonic():
+                del self._rankings[key]
+                return None
+            return ranked
+
+    def store(self, key: tuple[Any, ...], ranked: list[RankedRecommendation]) -> None:
+        with self._lock:
+            if key not in self._rankings and len(self._rankings) >= self._max_entries:
+                del self._rankings[next(iter(self._rankings))]
+            self._rankings[key] = (time.monotonic() + self._ttl_seconds, ranked)
+
+
+JOB_SOURCE_COLUMNS = (
+    "source_id, name, source_type, config_json, enabled, created_at, updated_at, "
+    "last_scan_at, last_success_at, last_status, last_error, next_eligible_scan_at, "
+    "consecutive_failures"
+)
+API_TOKEN_COLUMNS = (
+    "token_id, name, scopes_json, notes, created_at, updated_at, expires_at, revoked_at, "
+    "last_used_at, last_used_ip, last_used_user_agent, "
+    "(revoked_at IS NULL AND (expires_at IS NULL OR expires_at > ?)) AS active"
+)
+SELECT_JOB_SOURCES_SQL = f"SELECT {JOB_SOURCE_COLUMNS} FROM job_sources"
+GET_JOB_SOURCE_SQL = f"{SELECT_JOB_SOURCES_SQL} WHERE source_id = ?"
+LIST_JOB_SOURCES_SQL = f"{SELECT_JOB_SOURCES_SQL} ORDER BY source_id"
+LIST_ENABLED_JOB_SOURCES_SQL = f"{SELECT_JOB_SOURCES_SQL} WHERE enabled = 1 ORDER BY source_id"
+SELECT_API_TOKENS_SQL = f"SELECT {API_TOKEN_COLUMNS} FROM api_tokens"
+GET_API_TOKEN_SQL = f"{SELECT_API_TOKENS_SQL} WHERE token_id = ?"
+LIST_API_TOKENS_SQL = f"{SELECT_API_TOKENS_SQL} ORDER BY created_at DESC"
+LIST_ACTIVE_API_TOKENS_SQL = (
+    f"{SELECT_API_TOKENS_SQL} WHERE revoked_at IS NULL ORDER BY created_at DESC"
+)
+
+RecommendContext = tuple[UserPreferenceProfile | None, list[StoredPosting]]
+
+
 class RecommenderRepository:
     def __init__(self, database_path: str) -> None:
         self.database_path = Path(database_path)
+        self._in_memory = database_path == ":memory:"
         self._connection: sqlite3.Connection | None = None
         self._lock = threading.RLock()
+        # Audit events and recommendation runs are buffered under their own lock so
+        # request handlers can enqueue them without waiting behind a long-running
+        # write on the connection lock; a background thread flushes them.
+        self._buffer_lock = threading.Lock()
+        self._audit_buffer: list[tuple[Any, ...]] = []
+        # Unused (next_id, last_id) ranges per table, reserved by _reserve_ids.
+        self._id_blocks: dict[str, list[tuple[int, int]]] = {
+            "audit_events": [],
+            "recommendation_runs": [],
+        }
+        self._recommendation_buffer: list[tuple[int, str, str, int, list[tuple[Any, ...]]]] = []
+        self._flush_stop = threading.Event()
+        self._flush_wakeup = threading.Event()
+        self._flusher: threading.Thread | None = None
+        # list_postings results keyed by limit; upsert_postings is the only writer of
+        # job_postings and clears it.
+        self._postings_cache: dict[int, list[StoredPosting]] = {}
+        self._postings_generation = 0
+        # Bumped after every committed postings or profile write; callers that share
+        # in-flight recommend context loads key on it so a load started after a
+        # write never reuses one started before it.
+        self._recommend_context_generation = 0
+        # Reads run on their own read-only connections so they don't queue behind
+        # the writer lock; WAL lets them proceed while a write is in flight.
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(
+            maxsize=READER_POOL_SIZE
+        )
+
+    @property
+    def recommend_context_generation(self) -> int:
+        return self._recommend_context_generation
 
     @property
     def connection(self) -> sqlite3.Connection:
@@ -456,12 +643,63 @@ class RecommenderRepository:
             raise RuntimeError("Database connection is not initialized")
         return self._connection
 
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        if self._in_memory:
+            # A second connection to ":memory:" would open a separate, empty database,
+            # so in-memory repositories read through the writer connection instead.
+            with self._lock:
+                yield self.connection
+            return
+        try:
+            connection = self._readers.get_nowait()
+        except queue.Empty:
+            connection = self._open_reader()
+        try:
+            yield connection
+        finally:
+            try:
+                self._readers.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+
+    def _open_reader(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise RuntimeError("Database connection is not initialized")
+        connection = sqlite3.connect(
+            f"{self.database_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+        )
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA query_only=ON")
+        self._apply_cache_pragmas(connection)
+        return connection
+
+    @staticmethod
+    def _apply_cache_pragmas(connection: sqlite3.Connection) -> None:
+        # These settings are per connection, so the writer and every pooled reader
+        # need them; most reads go through the pool.
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute("PRAGMA mmap_size=268435456")
+        connection.execute("PRAGMA cache_size=-65536")
+
     def connect(self) -> None:
         with self._lock:
             self.database_path.parent.mkdir(parents=True, exist_ok=True)
-            self._connection = sqlite3.connect(self.database_path, check_same_thread=False)
+            self._connection = sqlite3.connect(
+                self.database_path,
+                check_same_thread=False,
+                cached_statements=SQLITE_CACHED_STATEMENTS,
+            )
             self._connection.row_factory = sqlite3.Row
             self._connection.execute("PRAGMA foreign_keys=ON")
+            # WAL with synchronous=NORMAL only fsyncs at checkpoints; a crash can lose
+            # the latest commits but never corrupts the database.
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._apply_cache_pragmas(self._connection)
             self._connection.executescript(
                 """
                 CREATE TABLE IF NOT EXISTS job_postings (
@@ -486,7 +724,8 @@ class RecommenderRepository:
                 CREATE TABLE IF NOT EXISTS recommendation_runs (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     resume_text TEXT NOT NULL,
-                    generated_at TEXT NOT NULL
+                    generated_at TEXT NOT NULL,
+                    recommendation_count INTEGER NOT NULL DEFAULT 0
                 );
 
                 CREATE TABLE IF NOT EXISTS recommendation_items (
@@ -569,11 +808,108 @@ class RecommenderRepository:
                 );
                 """
             )
-            self._ensure_job_postings_columns()
-            self._ensure_job_sources_columns()
-            self._ensure_audit_events_columns()
-            self._ensure_api_tokens_columns()
+            schema_version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if schema_version < SCHEMA_VERSION:
+                self._ensure_job_postings_columns()
+                self._ensure_job_sources_columns()
+                self._ensure_recommendation_runs_columns()
+                self._ensure_audit_events_columns()
+                self._ensure_api_tokens_columns()
+                self._ensure_indexes()
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             self._connection.commit()
+            self._connection.execute("PRAGMA optimize=0x10002")
+            for blocks in self._id_blocks.values():
+                blocks.clear()
+            for table in self._id_blocks:
+                self._reserve_ids(table)
+            self._flush_stop.clear()
+            self._flush_wakeup.clear()
+            self._flusher = threading.Thread(
+                target=self._run_buffer_flusher,
+                name="recommender-write-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def _max_assigned_id(self, table: str) -> int:
+        # Reserved ids only exist in sqlite_sequence until their rows are flushed, so
+        # take the larger of the live rows and the AUTOINCREMENT high-water mark.
+        return int(
+            self.connection.execute(
+                f"""
+                SELECT MAX(
+                    COALESCE((SELECT MAX(id) FROM {table}), 0),
+                    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0)
+                )
+                """,
+                (table,),
+            ).fetchone()[0]
+        )
+
+    def _reserve_ids(self, table: str) -> None:
+        # Moving the AUTOINCREMENT high-water mark past the block keeps every other
+        # writer on this database file, reserving or not, from assigning these ids.
+        with self._lock:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                first_id = self._max_assigned_id(table) + 1
+                last_id = first_id + ID_RESERVATION_BLOCK_SIZE - 1
+                cursor = connection.execute(
+                    "UPDATE sqlite_sequence SET seq = ? WHERE name = ?",
+                    (last_id, table),
+                )
+                if cursor.rowcount == 0:
+                    connection.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                        (table, last_id),
+                    )
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+                raise
+        with self._buffer_lock:
+            self._id_blocks[table].append((first_id, last_id))
+
+    def _remaining_ids(self, table: str) -> int:
+        with self._buffer_lock:
+            return sum(last_id - next_id + 1 for next_id, last_id in self._id_blocks[table])
+
+    def _next_id(self, table: str) -> int:
+        while True:
+            with self._buffer_lock:
+                blocks = self._id_blocks[table]
+                if blocks:
+                    next_id, last_id = blocks[0]
+                    if next_id == last_id:
+                        blocks.pop(0)
+                    else:
+                        blocks[0] = (next_id + 1, last_id)
+                    return next_id
+            # Only reached when requests outpace the flusher's reservations.
+            self._reserve_ids(table)
+
+    def _ensure_indexes(self) -> None:
+        # Created after the column migrations so older databases have every indexed
+        # column. Single-column indexes still serve "ORDER BY id DESC" filters because
+        # SQLite appends the rowid to each index entry. Run history reads the stored
+        # recommendation_count, so nothing looks up recommendation_items by run_id.
+        self.connection.executescript(
+            """
+            CREATE INDEX IF NOT EXISTS idx_job_postings_dedup_key
+                ON job_postings(dedup_key);
+            CREATE INDEX IF NOT EXISTS idx_job_postings_updated_at
+                ON job_postings(updated_at);
+            CREATE INDEX IF NOT EXISTS idx_job_source_scan_history_source_id
+                ON job_source_scan_history(source_id);
+            CREATE INDEX IF NOT EXISTS idx_audit_events_action
+                ON audit_events(action);
+            CREATE INDEX IF NOT EXISTS idx_audit_events_status
+                ON audit_events(status);
+            DROP INDEX IF EXISTS idx_recommendation_items_run_id;
+            """
+        )
 
     def _ensure_job_postings_columns(self) -> None:
         column_rows = self.connection.execute("PRAGMA table_info(job_postings)").fetchall()
@@ -614,6 +950,25 @@ class RecommenderRepository:
                 f"ALTER TABLE job_sources ADD COLUMN {column_name} {definition}"
             )
 
+    def _ensure_recommendation_runs_columns(self) -> None:
+        column_rows = self.connection.execute("PRAGMA table_info(recommendation_runs)").fetchall()
+        existing = {row["name"] for row in column_rows}
+        if "recommendation_count" not in existing:
+            self.connection.execute(
+                "ALTER TABLE recommendation_runs "
+                "ADD COLUMN recommendation_count INTEGER NOT NULL DEFAULT 0"
+            )
+            self.connection.execute(
+                """
+                UPDATE recommendation_runs
+                SET recommendation_count = (
+                    SELECT COUNT(1)
+                    FROM recommendation_items i
+                    WHERE i.run_id = recommendation_runs.id
+                )
+                """
+            )
+
     def _ensure_audit_events_columns(self) -> None:
         column_rows = self.connection.execute("PRAGMA table_info(audit_events)").fetchall()
         existing = {row["name"] for row in column_rows}
@@ -638,12 +993,43 @@ class RecommenderRepository:
             )
 
     def close(self) -> None:
+        self._flush_stop.set()
+        self._flush_wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
         with self._lock:
             if self._connection is None:
                 return
+            self.flush_audit_events()
+            self.flush_recommendations()
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
             self._connection.close()
             self._connection = None
 
+    def _run_buffer_flusher(self) -> None:
+        while not self._flush_stop.is_set():
+            self._flush_wakeup.wait(WRITE_BUFFER_FLUSH_INTERVAL_SECONDS)
+            self._flush_wakeup.clear()
+            for table in self._id_blocks:
+                if self._remaining_ids(table) < ID_RESERVATION_BLOCK_SIZE // 2:
+                    try:
+                        self._reserve_ids(table)
+                    except sqlite3.Error:
+                        LOGGER.exception("Failed to reserve ids for %s", table)
+            try:
+                self.flush_audit_events()
+            except sqlite3.Error:
+                LOGGER.exception("Failed to flush buffered audit events")
+            try:
+                self.flush_recommendations()
+            except sqlite3.Error:
+                LOGGER.exception("Failed to flush buffered recommendation runs")
+
     def upsert_postings(
         self,
         postings: list[JobPosting],
@@ -656,78 +1042,27 @@ class RecommenderRepository:
                     return UpsertSummary(updated=0, possible_duplicates=0)
                 return 0
 
+            self._postings_cache.clear()
+            self._postings_generation += 1
             now = now_utc_iso()
-            possible_duplicates = 0
+            rows: list[tuple[Any, ...]] = []
             for posting in postings:
                 title = normalize_whitespace(posting.title)
                 description = normalize_whitespace(posting.description) or title
                 company = normalize_whitespace(posting.company or "") or None
                 location = normalize_whitespace(posting.location or "") or None
                 apply_url = (posting.apply_url or "").strip() or None
-                source_id = (posting.source_id or "").strip() or None
-                external_id = (posting.external_id or "").strip() or None
-
                 normalized_title = normalize_text(title)
                 normalized_company = normalize_text(company or "")
                 normalized_location = normalize_text(location or "")
-                normalized_url = normalize_url(apply_url)
-                dedup_key = posting.dedup_key or build_dedup_key(
-                    title,
-                    company,
-                    location,
-                    apply_url,
-                )
-
-                duplicate_hint_count = int(
-                    self.connection.execute(
-                        """
-                        SELECT COUNT(1) AS c
-                        FROM job_postings
-                        WHERE dedup_key = ? AND id != ?
-                        """,
-                        (dedup_key, posting.id),
-                    ).fetchone()["c"]
+                normalized_apply_url = normalize_url(apply_url)
+                dedup_key = posting.dedup_key or hash_dedup_key(
+                    normalized_title,
+                    normalized_company,
+                    normalized_location,
+                    normalized_apply_url,
                 )
-                if duplicate_hint_count > 0:
-                    possible_duplicates += 1
-
-                self.connection.execute(
-                    """
-                    INSERT INTO job_postings (
-                        id,
-                        title,
-                        description,
-                        company,
-                        location,
-                        apply_url,
-                        source_id,
-                        external_id,
-                        normalized_title,
-                        normalized_company,
-                        normalized_location,
-                        normalized_url,
-                        dedup_key,
-                        duplicate_hint_count,
-                        created_at,
-                        updated_at
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(id) DO UPDATE SET
-                        title = excluded.title,
-                        description = excluded.description,
-                        company = excluded.company,
-                        location = excluded.location,
-                        apply_url = excluded.apply_url,
-                        source_id = excluded.source_id,
-                        external_id = excluded.external_id,
-                        normalized_title = excluded.normalized_title,
-                        normalized_company = excluded.normalized_company,
-                        normalized_location = excluded.normalized_location,
-                        normalized_url = excluded.normalized_url,
-                        dedup_key = excluded.dedup_key,
-                        duplicate_hint_count = excluded.duplicate_hint_count,
-                        updated_at = excluded.updated_at
-                    """,
+                rows.append(
                     (
                         posting.id,
                         title,
@@ -735,27 +1070,100 @@ class RecommenderRepository:
                         company,
                         location,
                         apply_url,
-                        source_id,
-                        external_id,
+                        (posting.source_id or "").strip() or None,
+                        (posting.external_id or "").strip() or None,
                         normalized_title,
                         normalized_company,
                         normalized_location,
-                        normalized_url,
+                        normalized_apply_url,
                         dedup_key,
-                        duplicate_hint_count,
-                        now,
-                        now,
-                    ),
+                    )
                 )
 
+            # Replay the batch against the ids already stored under each dedup_key so
+            # every row's hint counts the same rows a one-at-a-time upsert would see.
+            ids_by_key: dict[str, set[str]] = {}
+            key_by_id: dict[str, str] = {}
+            batch_keys = list({row[12] for row in rows})
+            for offset in range(0, len(batch_keys), 500):
+                chunk = batch_keys[offset : offset + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for stored in self.connection.execute(
+                    f"SELECT id, dedup_key FROM job_postings WHERE dedup_key IN ({placeholders})",
+                    chunk,
+                ):
+                    ids_by_key.setdefault(stored["dedup_key"], set()).add(stored["id"])
+                    key_by_id[stored["id"]] = stored["dedup_key"]
+
+            possible_duplicates = 0
+            params: list[tuple[Any, ...]] = []
+            for row in rows:
+                posting_id, dedup_key = row[0], row[12]
+                members = ids_by_key.setdefault(dedup_key, set())
+                duplicate_hint_count = len(members) - (posting_id in members)
+                if duplicate_hint_count > 0:
+                    possible_duplicates += 1
+                previous_key = key_by_id.get(posting_id)
+                if previous_key is not None and previous_key != dedup_key:
+                    ids_by_key[previous_key].discard(posting_id)
+                members.add(posting_id)
+                key_by_id[posting_id] = dedup_key
+                params.append((*row, duplicate_hint_count, now, now))
+
+            self.connection.executemany(
+                """
+                INSERT INTO job_postings (
+                    id,
+                    title,
+                    description,
+                    company,
+                    location,
+                    apply_url,
+                    source_id,
+                    external_id,
+                    normalized_title,
+                    normalized_company,
+                    normalized_location,
+                    normalized_url,
+                    dedup_key,
+                    duplicate_hint_count,
+                    created_at,
+                    updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    company = excluded.company,
+                    location = excluded.location,
+                    apply_url = excluded.apply_url,
+                    source_id = excluded.source_id,
+                    external_id = excluded.external_id,
+                    normalized_title = excluded.normalized_title,
+                    normalized_company = excluded.normalized_company,
+                    normalized_location = excluded.normalized_location,
+                    normalized_url = excluded.normalized_url,
+                    dedup_key = excluded.dedup_key,
+                    duplicate_hint_count = excluded.duplicate_hint_count,
+                    updated_at = excluded.updated_at
+                """,
+                params,
+            )
+
             self.connection.commit()
+            self._recommend_context_generation += 1
             if return_stats:
                 return UpsertSummary(updated=len(postings), possible_duplicates=possible_duplicates)
             return len(postings)
 
     def list_postings(self, limit: int) -> list[StoredPosting]:
         with self._lock:
-            cursor = self.connection.execute(
+            cached = self._postings_cache.get(limit)
+            if cached is not None:
+                return list(cached)
+            generation = self._postings_generation
+        with self._reader() as connection:
+            cursor = connection.execute(
                 """
                 SELECT
                     id,
@@ -775,48 +1183,144 @@ class RecommenderRepository:
                 """,
                 (limit,),
             )
-            return [StoredPosting(**dict(row)) for row in cursor.fetchall()]
+            postings = [StoredPosting.model_construct(**dict(row)) for row in cursor.fetchall()]
+        with self._lock:
+            # An upsert that landed while we were reading may have been missed; only
+            # cache the result if the postings table is unchanged since the lookup.
+            if generation == self._postings_generation:
+                if len(self._postings_cache) >= POSTINGS_CACHE_MAX_ENTRIES:
+                    self._postings_cache.clear()
+                self._postings_cache[limit] = postings
+        return list(postings)
+
+    def load_recommend_context(
+        self,
+        profile_id: str | None,
+        postings_limit: int | None,
+    ) -> RecommendContext:
+        profile = self.get_user_profile(profile_id) if profile_id else None
+        postings = self.list_postings(postings_limit) if postings_limit else []
+        return profile, postings
 
     def record_recommendations(
         self,
         resume_text: str,
         recommendations: list[RankedRecommendation],
     ) -> tuple[int, str]:
-        with self._lock:
-            generated_at = now_utc_iso()
-            cursor = self.connection.execute(
-                """
-                INSERT INTO recommendation_runs (resume_text, generated_at)
-                VALUES (?, ?)
-                """,
-                (resume_text, generated_at),
-            )
-            run_id = int(cursor.lastrowid)
-            self.connection.executemany(
-                """
-                INSERT INTO recommendation_items (run_id, job_id, title, score, rank)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                [
-                    (run_id, recommendation.id, recommendation.title, recommendation.score, rank)
-                    for rank, recommendation in enumerate(recommendations, start=1)
-                ],
+        generated_at = now_utc_iso()
+        run_id = self._next_id("recommendation_runs")
+        with self._buffer_lock:
+            items = [
+                (run_id, recommendation.id, recommendation.title, recommendation.score, rank)
+                for rank, recommendation in enumerate(recommendations, start=1)
+            ]
+            self._recommendation_buffer.append(
+                (run_id, resume_text, generated_at, len(items), items)
             )
-            self.connection.commit()
+            if len(self._recommendation_buffer) >= WRITE_BUFFER_FLUSH_BATCH_SIZE:
+                self._flush_wakeup.set()
             return run_id, generated_at
 
-    def list_recommendation_runs(self, limit: int) -> list[RecommendationRun]:
+    def flush_recommendations(self) -> int:
         with self._lock:
-            cursor = self.connection.execute(
+            if self._connection is None:
+                return 0
+            with self._buffer_lock:
+                runs = self._recommendation_buffer
+                self._recommendation_buffer = []
+            if not runs:
+                return 0
+            try:
+                self._insert_recommendation_runs(runs)
+                self.connection.commit()
+            except sqlite3.IntegrityError:
+                self.connection.rollback()
+                self._insert_recommendation_runs_individually(runs)
+            except sqlite3.Error:
+                self.connection.rollback()
+                with self._buffer_lock:
+                    self._recommendation_buffer = runs + self._recommendation_buffer
+                raise
+            return len(runs)
+
+    def _insert_recommendation_runs_individually(
+        self,
+        runs: list[tuple[int, str, str, int, list[tuple[Any, ...]]]],
+    ) -> None:
+        for index, run in enumerate(runs):
+            try:
+                try:
+                    self._insert_recommendation_runs([run])
+                except sqlite3.IntegrityError:
+                    # Same recovery as audit events: a run whose reserved id was taken
+                    # by another writer is stored under a fresh id.
+                    self.connection.rollback()
+                    cursor = self.connection.execute(
+                        """
+                        INSERT INTO recommendation_runs (
+                            resume_text,
+                            generated_at,
+                            recommendation_count
+                        )
+                        VALUES (?, ?, ?)
+                        """,
+                        run[1:4],
+                    )
+                    new_run_id = int(cursor.lastrowid)
+                    self._insert_recommendation_items(
+                        [(new_run_id, *item[1:]) for item in run[4]]
+                    )
+                    LOGGER.warning(
+                        "Recommendation run %s was stored as run %s", run[0], new_run_id
+                    )
+                self.connection.commit()
+            except sqlite3.Error:
+                self.connection.rollback()
+                with self._buffer_lock:
+                    self._recommendation_buffer = runs[index:] + self._recommendation_buffer
+                raise
+
+    def _insert_recommendation_runs(
+        self,
+        runs: list[tuple[int, str, str, int, list[tuple[Any, ...]]]],
+    ) -> None:
+        self.connection.executemany(
+            """
+            INSERT INTO recommendation_runs (
+                id,
+                resume_text,
+                generated_at,
+                recommendation_count
+            )
+            VALUES (?, ?, ?, ?)
+            """,
+            [run[:4] for run in runs],
+        )
+        self._insert_recommendation_items([item for run in runs for item in run[4]])
+
+    def _insert_recommendation_items(self, items: list[tuple[Any, ...]]) -> None:
+        self.connection.executemany(
+            """
+            INSERT INTO recommendation_items (run_id, job_id, title, score, rank)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            items,
+        )
+
+    def list_recommendation_runs(self, limit: int) -> list[RecommendationRun]:
+        try:
+            self.flush_recommendations()
+        except sqlite3.Error:
+            LOGGER.exception("Failed to flush buffered recommendation runs before listing them")
+        with self._reader() as connection:
+            cursor = connection.execute(
                 """
                 SELECT
-                    r.id AS run_id,
-                    r.generated_at AS generated_at,
-                    COUNT(i.id) AS recommendation_count
-                FROM recommendation_runs r
-                LEFT JOIN recommendation_items i ON i.run_id = r.id
-                GROUP BY r.id, r.generated_at
-                ORDER BY r.id DESC
+                    id AS run_id,
+                    generated_at,
+                    recommendation_count
+                FROM recommendation_runs
+                ORDER BY id DESC
                 LIMIT ?
                 """,
                 (limit,),
@@ -865,77 +1369,16 @@ class RecommenderRepository:
         return source
 
     def get_job_source(self, source_id: str) -> JobSource | None:
-        with self._lock:
-            row = self.connection.execute(
-                """
-                SELECT
-                    source_id,
-                    name,
-                    source_type,
-                    config_json,
-                    enabled,
-                    created_at,
-                    updated_at,
-                    last_scan_at,
-                    last_success_at,
-                    last_status,
-                    last_error,
-                    next_eligible_scan_at,
-                    consecutive_failures
-                FROM job_sources
-                WHERE source_id = ?
-                """,
-                (source_id,),
-            ).fetchone()
+        with self._reader() as connection:
+            row = connection.execute(GET_JOB_SOURCE_SQL, (source_id,)).fetchone()
             if row is None:
                 return None
             return self._to_job_source(row)
 
     def list_job_sources(self, enabled_only: bool = False) -> list[JobSource]:
-        with self._lock:
-            if enabled_only:
-                cursor = self.connection.execute(
-                    """
-                    SELECT
-                        source_id,
-                        name,
-                        source_type,
-                        config_json,
-                        enabled,
-                        created_at,
-                        updated_at,
-                        last_scan_at,
-                        last_success_at,
-                        last_status,
-                        last_error,
-                        next_eligible_scan_at,
-                        consecutive_failures
-                    FROM job_sources
-                    WHERE enabled = 1
-                    ORDER BY source_id
-                    """
-                )
-            else:
-                cursor = self.connection.execute(
-                    """
-                    SELECT
-                        source_id,
-                        name,
-                        source_type,
-                        config_json,
-                        enabled,
-                        created_at,
-                        updated_at,
-                        last_scan_at,
-                        last_success_at,
-                        last_status,
-                        last_error,
-                        next_eligible_scan_at,
-                        consecutive_failures
-                    FROM job_sources
-                    ORDER BY source_id
-                    """
-                )
+        with self._reader() as connection:
+            query = LIST_ENABLED_JOB_SOURCES_SQL if enabled_only else LIST_JOB_SOURCES_SQL
+            cursor = connection.execute(query)
             return [self._to_job_source(row) for row in cursor.fetchall()]
 
     def list_scan_targets(
@@ -945,24 +1388,8 @@ class RecommenderRepository:
         respect_backoff: bool,
         now_iso: str,
     ) -> list[JobSource]:
-        with self._lock:
-            query = """
-                SELECT
-                    source_id,
-                    name,
-                    source_type,
-                    config_json,
-                    enabled,
-                    created_at,
-                    updated_at,
-                    last_scan_at,
-                    last_success_at,
-                    last_status,
-                    last_error,
-                    next_eligible_scan_at,
-                    consecutive_failures
-                FROM job_sources
-            """
+        with self._reader() as connection:
+            query = SELECT_JOB_SOURCES_SQL
             filters: list[str] = []
             params: list[Any] = []
             if enabled_only:
@@ -973,7 +1400,7 @@ class RecommenderRepository:
             if filters:
                 query += " WHERE " + " AND ".join(filters)
             query += " ORDER BY source_id"
-            cursor = self.connection.execute(query, tuple(params))
+            cursor = connection.execute(query, params)
             return [self._to_job_source(row) for row in cursor.fetchall()]
 
     def upsert_user_profile(self, payload: UserProfileUpsertRequest) -> UserPreferenceProfile:
@@ -1003,6 +1430,7 @@ class RecommenderRepository:
                 ),
             )
             self.connection.commit()
+            self._recommend_context_generation += 1
             return self.get_user_profile_or_raise(payload.profile_id)
 
     def get_user_profile_or_raise(self, profile_id: str) -> UserPreferenceProfile:
@@ -1012,8 +1440,8 @@ class RecommenderRepository:
         return profile
 
     def get_user_profile(self, profile_id: str) -> UserPreferenceProfile | None:
-        with self._lock:
-            row = self.connection.execute(
+        with self._reader() as connection:
+            row = connection.execute(
                 """
                 SELECT
                     profile_id,
@@ -1031,8 +1459,8 @@ class RecommenderRepository:
             return self._to_user_profile(row)
 
     def list_user_profiles(self) -> list[UserPreferenceProfile]:
-        with self._lock:
-            cursor = self.connection.execute(
+        with self._reader() as connection:
+            cursor = connection.execute(
                 """
                 SELECT
                     profile_id,
@@ -1053,13 +1481,14 @@ class RecommenderRepository:
                 (profile_id,),
             )
             self.connection.commit()
+            self._recommend_context_generation += 1
             return cursor.rowcount > 0
 
     def has_active_api_tokens(self) -> bool:
-        with self._lock:
+        with self._reader() as connection:
             now = now_utc_iso()
             count = int(
-                self.connection.execute(
+                connection.execute(
                     """
                     SELECT COUNT(1) AS c
                     FROM api_tokens
@@ -1126,71 +1555,19 @@ class RecommenderRepository:
         return token
 
     def get_api_token(self, token_id: str) -> ApiTokenMetadata | None:
-        with self._lock:
-            row = self.connection.execute(
-                """
-                SELECT
-                    token_id,
-                    name,
-                    scopes_json,
-                    notes,
-                    created_at,
-                    updated_at,
-                    expires_at,
-                    revoked_at,
-                    last_used_at,
-                    last_used_ip,
-                    last_used_user_agent
-                FROM api_tokens
-                WHERE token_id = ?
-                """,
-                (token_id,),
+        with self._reader() as connection:
+            row = connection.execute(
+                GET_API_TOKEN_SQL,
+                (now_utc_iso(), token_id),
             ).fetchone()
             if row is None:
                 return None
             return self._to_api_token_metadata(row)
 
     def list_api_tokens(self, *, include_revoked: bool) -> list[ApiTokenMetadata]:
-        with self._lock:
-            if include_revoked:
-                cursor = self.connection.execute(
-                    """
-                    SELECT
-                        token_id,
-                        name,
-                        scopes_json,
-                        notes,
-                        created_at,
-                        updated_at,
-                        expires_at,
-                        revoked_at,
-                        last_used_at,
-                        last_used_ip,
-                        last_used_user_agent
-                    FROM api_tokens
-                    ORDER BY created_at DESC
-                    """
-                )
-            else:
-                cursor = self.connection.execute(
-                    """
-                    SELECT
-                        token_id,
-                        name,
-                        scopes_json,
-                        notes,
-                        created_at,
-                        updated_at,
-                        expires_at,
-                        revoked_at,
-                        last_used_at,
-                        last_used_ip,
-                        last_used_user_agent
-                    FROM api_tokens
-                    WHERE revoked_at IS NULL
-                    ORDER BY created_at DESC
-                    """
-                )
+        with self._reader() as connection:
+            query = LIST_API_TOKENS_SQL if include_revoked else LIST_ACTIVE_API_TOKENS_SQL
+            cursor = connection.execute(query, (now_utc_iso(),))
             return [self._to_api_token_metadata(row) for row in cursor.fetchall()]
 
     def revoke_api_token(self, token_id: str) -> bool:
@@ -1207,13 +1584,12 @@ class RecommenderRepository:
             self.connection.commit()
             return cursor.rowcount > 0
 
-    def resolve_db_token(self, token_value: str) -> TokenAuthContext | None:
-        with self._lock:
+    def resolve_db_token(self, token_hash: str) -> TokenAuthContext | None:
+        with self._reader() as connection:
             now = now_utc_iso()
-            token_hash = hash_token(token_value)
-            row = self.connection.execute(
+            row = connection.execute(
                 """
-                SELECT token_id, scopes_json
+                SELECT token_id, scopes_json, expires_at
                 FROM api_tokens
                 WHERE token_hash = ?
                   AND revoked_at IS NULL
@@ -1228,6 +1604,7 @@ class RecommenderRepository:
                 scopes=scopes,
                 auth_subject=f"db-token:{row['token_id']}",
                 token_id=row["token_id"],
+                expires_at=row["expires_at"],
             )
 
     def touch_api_token_usage(
@@ -1236,10 +1613,12 @@ class RecommenderRepository:
         *,
         source_ip: str | None,
         user_agent: str | None,
-    ) -> None:
+    ) -> bool:
+        # Doubles as the per-request revocation and expiry check: a token revoked or
+        # expired since its context was cached matches no row.
         with self._lock:
             now = now_utc_iso()
-            self.connection.execute(
+            cursor = self.connection.execute(
                 """
                 UPDATE api_tokens
                 SET
@@ -1248,10 +1627,13 @@ class RecommenderRepository:
                     last_used_user_agent = ?,
                     updated_at = ?
                 WHERE token_id = ?
+                  AND revoked_at IS NULL
+                  AND (expires_at IS NULL OR expires_at > ?)
                 """,
-                (now, source_ip, user_agent, now, token_id),
+                (now, source_ip, user_agent, now, token_id, now),
             )
             self.connection.commit()
+            return cursor.rowcount > 0
 
     def record_audit_event(
         self,
@@ -1267,25 +1649,11 @@ class RecommenderRepository:
         status: str,
         message: str | None,
     ) -> int:
-        with self._lock:
-            cursor = self.connection.execute(
-                """
-                INSERT INTO audit_events (
-                    occurred_at,
-                    request_id,
-                    method,
-                    path,
-                    action,
-                    scope,
-                    source_ip,
-                    user_agent,
-                    auth_subject,
-                    status,
-                    message
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+        event_id = self._next_id("audit_events")
+        with self._buffer_lock:
+            self._audit_buffer.append(
                 (
+                    event_id,
                     now_utc_iso(),
                     request_id,
                     method,
@@ -1297,10 +1665,74 @@ class RecommenderRepository:
                     auth_subject,
                     status,
                     message,
-                ),
+                )
             )
-            self.connection.commit()
-            return int(cursor.lastrowid)
+            if len(self._audit_buffer) >= WRITE_BUFFER_FLUSH_BATCH_SIZE:
+                self._flush_wakeup.set()
+            return event_id
+
+    def flush_audit_events(self) -> int:
+        with self._lock:
+            if self._connection is None:
+                return 0
+            with self._buffer_lock:
+                rows = self._audit_buffer
+                self._audit_buffer = []
+            if not rows:
+                return 0
+            try:
+                self._insert_audit_event_rows(rows)
+                self.connection.commit()
+            except sqlite3.IntegrityError:
+                self.connection.rollback()
+                self._insert_audit_events_individually(rows)
+            except sqlite3.Error:
+                self.connection.rollback()
+                with self._buffer_lock:
+                    self._audit_buffer = rows + self._audit_buffer
+                raise
+            return len(rows)
+
+    def _insert_audit_events_individually(self, rows: list[tuple[Any, ...]]) -> None:
+        for index, row in enumerate(rows):
+            try:
+                try:
+                    self._insert_audit_event_rows([row])
+                except sqlite3.IntegrityError:
+                    # A writer that doesn't reserve ids already took this one. Keep the
+                    # event under a fresh id rather than retrying a row that can never
+                    # insert and blocking every flush behind it.
+                    self.connection.rollback()
+                    self._insert_audit_event_rows([(None, *row[1:])])
+                    LOGGER.warning("Audit event %s was stored under a new id", row[0])
+                self.connection.commit()
+            except sqlite3.Error:
+                self.connection.rollback()
+                with self._buffer_lock:
+                    self._audit_buffer = rows[index:] + self._audit_buffer
+                raise
+
+    def _insert_audit_event_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        self.connection.executemany(
+            """
+            INSERT INTO audit_events (
+                id,
+                occurred_at,
+                request_id,
+                method,
+                path,
+                action,
+                scope,
+                source_ip,
+                user_agent,
+                auth_subject,
+                status,
+                message
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
 
     def list_audit_events(
         self,
@@ -1309,7 +1741,12 @@ class RecommenderRepository:
         action: str | None,
         status: str | None,
     ) -> list[AuditEvent]:
-        with self._lock:
+        try:
+            self.flush_audit_events()
+        except sqlite3.Error:
+            # Serve what is already persisted; the flusher keeps retrying the buffer.
+            LOGGER.exception("Failed to flush buffered audit events before listing them")
+        with self._reader() as connection:
             query = """
                 SELECT
                     id AS event_id,
@@ -1338,8 +1775,9 @@ class RecommenderRepository:
                 query += " WHERE " + " AND ".join(filters)
             query += " ORDER BY id DESC LIMIT ?"
             params.append(limit)
-            cursor = self.connection.execute(query, tuple(params))
-            return [AuditEvent(**dict(row)) for row in cursor.fetchall()]
+            cursor = connection.execute(query, params)
+            # Rows come from our own writes, so skip per-field validation.
+            return [AuditEvent.model_construct(**dict(row)) for row in cursor.fetchall()]
 
     def record_job_source_scan_result(
         self,
@@ -1369,6 +1807,7 @@ class RecommenderRepository:
             if row is None:
                 raise KeyError(f"Unknown source_id: {source_id}")
 
+            scanned_dt = datetime.fromisoformat(scanned_at)
             previous_failures = int(row["consecutive_failures"] or 0)
             next_eligible_previous = row["next_eligible_scan_at"]
             previous_last_error = row["last_error"]
@@ -1387,21 +1826,17 @@ class RecommenderRepository:
             elif status == "error":
                 next_failure_count = previous_failures + 1
                 backoff_seconds = min(60 * (2 ** max(next_failure_count - 1, 0)), 3600)
-                next_eligible = datetime.fromisoformat(scanned_at) + timedelta(
-                    seconds=backoff_seconds
-                )
+                next_eligible = scanned_dt + timedelta(seconds=backoff_seconds)
                 next_eligible_scan_at = next_eligible.isoformat()
             elif status == "skipped":
                 attempt_number = previous_failures + 1
                 next_failure_count = previous_failures
                 next_eligible_scan_at = next_eligible_previous
                 last_error = previous_last_error
-                if next_eligible_scan_at:
-                    parsed_now = parse_iso_datetime(scanned_at)
-                    parsed_next = parse_iso_datetime(next_eligible_scan_at)
-                    if parsed_now and parsed_next:
-                        delta = parsed_next - parsed_now
-                        backoff_seconds = max(int(delta.total_seconds()), 0)
+                parsed_next = parse_iso_datetime(next_eligible_scan_at)
+                if parsed_next:
+                    delta = parsed_next - scanned_dt
+                    backoff_seconds = max(int(delta.total_seconds()), 0)
 
             self.connection.execute(
                 """
@@ -1488,7 +1923,7 @@ class RecommenderRepository:
         scanned_after: str | None,
         scanned_before: str | None,
     ) -> list[JobSourceScanHistoryItem]:
-        with self._lock:
+        with self._reader() as connection:
             query = """
                 SELECT
                     id AS history_id,
@@ -1528,10 +1963,10 @@ class RecommenderRepository:
             query += " ORDER BY id DESC LIMIT ? OFFSET ?"
             params.append(limit)
             params.append(offset)
-            cursor = self.connection.execute(query, tuple(params))
+            cursor = connection.execute(query, params)
             rows = cursor.fetchall()
             return [
-                JobSourceScanHistoryItem(
+                JobSourceScanHistoryItem.model_construct(
                     history_id=row["history_id"],
                     source_id=row["source_id"],
                     scanned_at=row["scanned_at"],
@@ -1551,7 +1986,7 @@ class RecommenderRepository:
 
     def _to_job_source(self, row: sqlite3.Row) -> JobSource:
         config: dict[str, Any] = json.loads(row["config_json"])
-        return JobSource(
+        return JobSource.model_construct(
             source_id=row["source_id"],
             name=row["name"],
             source_type=row["source_type"],
@@ -1569,7 +2004,7 @@ class RecommenderRepository:
 
     def _to_user_profile(self, row: sqlite3.Row) -> UserPreferenceProfile:
         config: dict[str, Any] = json.loads(row["config_json"])
-        return UserPreferenceProfile(
+        return UserPreferenceProfile.model_construct(
             profile_id=row["profile_id"],
             name=row["name"],
             preferred_keywords=config.get("preferred_keywords", []),
@@ -1582,39 +2017,57 @@ class RecommenderRepository:
 
     def _to_api_token_metadata(self, row: sqlite3.Row) -> ApiTokenMetadata:
         scopes = json.loads(row["scopes_json"])
-        now = now_utc_iso()
-        expires_at = row["expires_at"]
-        revoked_at = row["revoked_at"]
-        active = revoked_at is None and (expires_at is None or expires_at > now)
         return ApiTokenMetadata(
             token_id=row["token_id"],
             name=row["name"],
             scopes=scopes,
             created_at=row["created_at"],
             updated_at=row["updated_at"],
-            expires_at=expires_at,
-            revoked_at=revoked_at,
+            expires_at=row["expires_at"],
+            revoked_at=row["revoked_at"],
             last_used_at=row["last_used_at"],
             last_used_ip=row["last_used_ip"],
             last_used_user_agent=row["last_used_user_agent"],
             notes=row["notes"],
-            active=active,
+            active=bool(row["active"]),
         )
 
 
-def _token_overlap(reference: set[str], candidates: set[str]) -> float:
+@lru_cache(maxsize=256)
+def resume_token_set(resume_text: str) -> frozenset[str]:
+    # Keyed on the text itself, so repeated requests for the same resume (typically
+    # the same profile) reuse the tokens and an edited resume simply misses.
+    return frozenset(tokenize(resume_text))
+
+
+@lru_cache(maxsize=4096)
+def posting_token_set(text: str) -> frozenset[str]:
+    # Stored postings are ranked on every /recommend and boards repeat titles and
+    # companies, so the same field text is tokenized over and over.
+    return frozenset(tokenize(text))
+
+
+@lru_cache(maxsize=4096)
+def posting_all_tokens(title: str, description: str, company: str) -> frozenset[str]:
+    return posting_token_set(title) | posting_token_set(description) | posting_token_set(company)
+
+
+def _token_overlap(
+    reference: frozenset[str] | set[str],
+    candidates: frozenset[str] | set[str],
+) -> float:
     if not candidates:
         return 0.0
     return len(reference.intersection(candidates)) / len(candidates)
 
 
-def _freshness_bonus(updated_at: str | None) -> float:
+def _freshness_bonus(updated_at: str | None, now: datetime) -> float:
     updated = parse_iso_datetime(updated_at)
     if updated is None:
         return 0.0
     if updated.tzinfo is None:
         updated = updated.replace(tzinfo=UTC)
-    age_hours = (datetime.now(UTC) - updated).total_seconds() / 3600
+    age_hours = (now - updated).total_seconds() / 3600
     if age_hours <= 24:
         return 0.06
     if age_hours <= 72:
@@ -1632,39 +2085,55 @@ def rank_postings(
     preferred_locations: list[str] | None = None,
     preferred_companies: list[str] | None = None,
     remote_only: bool = False,
+    top_k: int | None = None,
 ) -> list[RankedRecommendation]:
-    resume_tokens = tokenize(resume_text)
+    resume_tokens = resume_token_set(resume_text)
     preferred_keyword_tokens = tokenize(" ".join(preferred_keywords or []))
-    preferred_locations_normalized = {normalize_text(value) for value in preferred_locations or []}
-    preferred_companies_normalized = {normalize_text(value) for value in preferred_companies or []}
+    preferred_locations_normalized = frozenset(map(normalize_text, preferred_locations or ()))
+    preferred_companies_normalized = frozenset(map(normalize_text, preferred_companies or ()))
 
-    ranked: list[RankedRecommendation] = []
+    now = datetime.now(UTC)
+    # Scores are gathered as plain tuples and only the winners are turned into
+    # response models, so a small top_k skips model construction for the rest.
+    scored: list[tuple[float, JobPosting, tuple[float, ...], frozenset[str]]] = []
     for posting in postings:
-        title_tokens = tokenize(posting.title)
-        description_tokens = tokenize(posting.description)
-        company_tokens = tokenize(posting.company or "")
-        all_job_tokens = title_tokens.union(description_tokens).union(company_tokens)
+        title_tokens = posting_token_set(posting.title)
+        description_tokens = posting_token_set(posting.description)
+        all_job_tokens = posting_all_tokens(
+            posting.title,
+            posting.description,
+            posting.company or "",
+        )
 
         title_overlap = _token_overlap(resume_tokens, title_tokens)
         description_overlap = _token_overlap(resume_tokens, description_tokens)
-        keyword_overlap = _token_overlap(preferred_keyword_tokens, all_job_tokens)
+        keyword_overlap = (
+            _token_overlap(preferred_keyword_tokens, all_job_tokens)
+            if preferred_keyword_tokens
+            else 0.0
+        )
 
         preference_bonus = 0.0
-        normalized_company = normalize_text(posting.company or "")
-        normalized_location = normalize_text(posting.location or "")
+        if preferred_companies_normalized:
+            normalized_company = normalize_text(posting.company or "")
+            if normalized_company and normalized_company in preferred_companies_normalized:
+                preference_bonus += 0.08
+        if preferred_locations_normalized:
+            normalized_location = normalize_text(posting.location or "")
+            if normalized_location and normalized_location in preferred_locations_normalized:
+                preference_bonus += 0.08
 
-        if normalized_company and normalized_company in preferred_companies_normalized:
-            preference_bonus += 0.08
-        if normalized_location and normalized_location in preferred_locations_normalized:
-            preference_bonus += 0.08
-
-        remote_signal = "remote" in normalize_text(
-            f"{posting.location or ''} {posting.title} {posting.description}"
-        )
         if remote_only:
+            # "remote" is all alphanumeric, so it survives normalize_text unchanged and a
+            # plain lowercase substring check gives the same answer without the regex.
+            remote_signal = (
+                "remote" in (posting.location or "").lower()
+                or "remote" in posting.title.lower()
+                or "remote" in posting.description.lower()
+            )
             preference_bonus += 0.08 if remote_signal else -0.05
 
-        freshness_bonus = _freshness_bonus(posting.updated_at)
+        freshness_bonus = _freshness_bonus(posting.updated_at, now)
         duplicate_penalty = min(0.02 * posting.duplicate_hint_count, 0.08)
 
         score = (
@@ -1676,32 +2145,63 @@ def rank_postings(
             - duplicate_penalty
         )
         score = max(score, 0.0)
-        matched_terms = sorted(list(resume_tokens.intersection(all_job_tokens)))[:12]
-
-        breakdown = ScoreBreakdown(
-            title_overlap=round(title_overlap, 4),
-            description_overlap=round(description_overlap, 4),
-            preferred_keyword_overlap=round(keyword_overlap, 4),
-            preference_bonus=round(preference_bonus, 4),
-            freshness_bonus=round(freshness_bonus, 4),
-            duplicate_penalty=round(duplicate_penalty, 4),
-            final_score=round(score, 4),
+        components = (
+            title_overlap,
+            description_overlap,
+            keyword_overlap,
+            preference_bonus,
+            freshness_bonus,
+            duplicate_penalty,
+            score,
         )
-        ranked.append(
-            RankedRecommendation(
-                id=posting.id,
-                title=posting.title,
-                company=posting.company,
-                location=posting.location,
-                apply_url=posting.apply_url,
-                score=round(score, 4),
-                matched_terms=matched_terms,
-                score_breakdown=breakdown,
-            )
+        scored.append(
+            (round(score, 4), posting, components, resume_tokens.intersection(all_job_tokens))
         )
 
-    ranked.sort(key=lambda item: item.score, reverse=True)
-    return ranked
+    if top_k is not None and top_k < len(scored):
+        winners = heapq.nlargest(top_k, scored, key=lambda item: item[0])
+    else:
+        winners = sorted(scored, key=lambda item: item[0], reverse=True)
+    return [
+        _build_recommendation(posting, rounded_score, components, matched)
+        for rounded_score, posting, components, matched in winners
+    ]
+
+
+def _build_recommendation(
+    posting: JobPosting,
+    rounded_score: float,
+    components: tuple[float, ...],
+    matched: frozenset[str],
+) -> RankedRecommendation:
+    (
+        title_overlap,
+        description_overlap,
+        keyword_overlap,
+        preference_bonus,
+        freshness_bonus,
+        duplicate_penalty,
+        score,
+    ) = components
+    breakdown = ScoreBreakdown(
+        title_overlap=round(title_overlap, 4),
+        description_overlap=round(description_overlap, 4),
+        preferred_keyword_overlap=round(keyword_overlap, 4),
+        preference_bonus=round(preference_bonus, 4),
+        freshness_bonus=round(freshness_bonus, 4),
+        duplicate_penalty=round(duplicate_penalty, 4),
+        final_score=round(score, 4),
+    )
+    return RankedRecommendation(
+        id=posting.id,
+        title=posting.title,
+        company=posting.company,
+        location=posting.location,
+        apply_url=posting.apply_url,
+        score=rounded_score,
+        matched_terms=sorted(matched)[:12],
+        score_breakdown=breakdown,
+    )
 
 
 def resolve_recommendation_preferences(
@@ -1736,29 +2236,35 @@ def to_job_postings_from_payload(
     if not isinstance(raw_postings, list):
         raise ValueError("Source payload postings must be a list.")
 
-    postings: list[JobPosting] = []
-    scan_marker = scanned_at.replace("-", "").replace(":", "").replace(".", "")
+    # Keyed by posting id: repeated ids in one payload would only overwrite each
+    # other on upsert, so keep the last occurrence. Postings that merely share a
+    # dedup_key stay separate and get a duplicate hint instead.
+    postings: dict[str, JobPosting] = {}
+    scan_marker = scanned_at.translate(SCAN_MARKER_TRANSLATION)
 
+    # normalize_whitespace already drops leading/trailing whitespace, so the
+    # normalized fields skip the separate strip().
+    normalize = normalize_whitespace
     for index, item in enumerate(raw_postings, start=1):
         if not isinstance(item, dict):
             continue
-        title = normalize_whitespace(str(item.get("title", "")).strip())
-        description = normalize_whitespace(str(item.get("description", "")).strip()) or title
-        company = normalize_whitespace(str(item.get("company", "")).strip()) or None
-        location = normalize_whitespace(str(item.get("location", "")).strip()) or None
-        apply_url = str(item.get("apply_url", "")).strip() or None
+        get = item.get
+        title = normalize(str(get("title", "")))
         if not title:
             continue
-
-        external_id_candidates = [item.get("external_id"), item.get("id")]
-        external_id = next(
-            (
-                str(value).strip()
-                for value in external_id_candidates
-                if value is not None and str(value).strip()
-            ),
-            None,
-        )
+        description = normalize(str(get("description", ""))) or title
+        company = normalize(str(get("company", ""))) or None
+        location = normalize(str(get("location", ""))) or None
+        apply_url = str(get("apply_url", "")).strip() or None
+
+        external_id = None
+        raw_external_id = get("external_id")
+        if raw_external_id is not None:
+            external_id = str(raw_external_id).strip() or None
+        if external_id is None:
+            raw_external_id = get("id")
+            if raw_external_id is not None:
+                external_id = str(raw_external_id).strip() or None
 
         if external_id:
             posting_id = f"{source_id}::{external_id}"
@@ -1775,27 +2281,36 @@ def to_job_postings_from_payload(
                     scan_marker,
                 ]
             )
-            digest = hashlib.sha1(base.encode()).hexdigest()
-            posting_id = f"{source_id}::{digest[:14]}"
-
-        postings.append(
-            JobPosting(
-                id=posting_id,
-                title=title,
-                description=description,
-                company=company,
-                location=location,
-                apply_url=apply_url,
-                source_id=source_id,
-                external_id=external_id,
-                updated_at=scanned_at,
-                dedup_key=build_dedup_key(title, company, location, apply_url),
-            )
+            digest = hashlib.blake2b(base.encode(), digest_size=7).hexdigest()
+            posting_id = f"{source_id}::{digest}"
+
+        postings[posting_id] = JobPosting.model_construct(
+            id=posting_id,
+            title=title,
+            description=description,
+            company=company,
+            location=location,
+            apply_url=apply_url,
+            source_id=source_id,
+            external_id=external_id,
+            updated_at=scanned_at,
+            dedup_key=build_dedup_key(title, company, location, apply_url),
         )
-    return postings
+    return list(postings.values())
 
 
-def load_source_payload(source: JobSource) -> Any:
+def build_http_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    # json_url sources are often behind redirects (http->https, CDN moves); follow
+    # them like urllib did instead of failing the scan on a 3xx.
+    return httpx.AsyncClient(
+        timeout=SOURCE_FETCH_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_keepalive_connections=32),
+        follow_redirects=True,
+        transport=transport,
+    )
+
+
+async def load_source_payload(source: JobSource, http_client: httpx.AsyncClient) -> Any:
     if source.source_type not in SOURCE_TYPES:
         raise ValueError(f"Unsupported source type: {source.source_type}")
 
@@ -1805,24 +2320,27 @@ def load_source_payload(source: JobSource) -> Any:
     url = str(source.config.get("url", "")).strip()
     if not url:
         raise ValueError("Missing url in job source config.")
-    with urllib_request.urlopen(url, timeout=15) as response:
-        body = response.read().decode("utf-8")
-        return json.loads(body)
+    response = await http_client.get(url)
+    response.raise_for_status()
+    return response.json()
 
 
-def scan_source(
+async def scan_source(
     repository: RecommenderRepository,
     source: JobSource,
     *,
+    http_client: httpx.AsyncClient,
     trigger: Literal["manual", "scheduled"],
     respect_backoff: bool,
+    now: datetime | None = None,
 ) -> JobSourceScanResult:
-    scanned_at = now_utc_iso()
+    scanned_dt = now or datetime.now(UTC)
+    scanned_at = scanned_dt.isoformat()
     if respect_backoff and source.next_eligible_scan_at:
-        parsed_now = parse_iso_datetime(scanned_at)
         parsed_next = parse_iso_datetime(source.next_eligible_scan_at)
-        if parsed_now and parsed_next and parsed_next > parsed_now:
-            return repository.record_job_source_scan_result(
+        if parsed_next and parsed_next > scanned_dt:
+            return await run_in_threadpool(
+                repository.record_job_source_scan_result,
                 source.source_id,
                 scanned_at=scanned_at,
                 trigger=trigger,
@@ -1835,10 +2353,20 @@ def scan_source(
             )
 
     try:
-        payload = load_source_payload(source)
-        postings = to_job_postings_from_payload(source.source_id, payload, scanned_at=scanned_at)
-        summary = repository.upsert_postings(postings, return_stats=True)
-        return repository.record_job_source_scan_result(
+        payload = await load_source_payload(source, http_client)
+        postings = await run_in_threadpool(
+            to_job_postings_from_payload,
+            source.source_id,
+            payload,
+            scanned_at=scanned_at,
+        )
+        summary = await run_in_threadpool(
+            repository.upsert_postings,
+            postings,
+            return_stats=True,
+        )
+        return await run_in_threadpool(
+            repository.record_job_source_scan_result,
             source.source_id,
             scanned_at=scanned_at,
             trigger=trigger,
@@ -1851,7 +2379,8 @@ def scan_source(
         )
     except Exception as exc:
         error_text = str(exc)
-        return repository.record_job_source_scan_result(
+        return await run_in_threadpool(
+            repository.record_job_source_scan_result,
             source.source_id,
             scanned_at=scanned_at,
             trigger=trigger,
@@ -1864,6 +2393,39 @@ def scan_source(
         )
 
 
+def summarize_scan_results(
+    results: list[JobSourceScanResult],
+    *,
+    trigger: Literal["manual", "scheduled"],
+    respect_backoff: bool,
+) -> JobSourceScanBatchResponse:
+    successful = failed = skipped = 0
+    total_ingested = possible_duplicates = 0
+    for result in results:
+        status = result.status
+        if status == "ok":
+            successful += 1
+        elif status == "error":
+            failed += 1
+        else:
+            skipped += 1
+        total_ingested += result.ingested
+        possible_duplicates += result.possible_duplicates
+
+    return JobSourceScanBatchResponse(
+        scanned_at=now_utc_iso(),
+        trigger=trigger,
+        respect_backoff=respect_backoff,
+        requested_sources=len(results),
+        successful_sources=successful,
+        failed_sources=failed,
+        skipped_sources=skipped,
+        total_ingested=total_ingested,
+        possible_duplicates=possible_duplicates,
+        results=results,
+    )
+
+
 def create_app(
     *,
     database_path: str | None = None,
@@ -1891,22 +2453,45 @@ def create_app(
     if resolved_api_key:
         resolved_token_map.setdefault(resolved_api_key, set()).add("*")
 
+    scan_concurrency = max(
+        int(os.getenv("RECOMMENDER_SCAN_CONCURRENCY", str(DEFAULT_SCAN_CONCURRENCY))),
+        1,
+    )
+
+    # Env tokens are kept only as hashes, keyed the same way as DB-managed tokens.
+    env_token_contexts = {
+        hash_token(token): TokenAuthContext(
+            scopes=scopes,
+            auth_subject=build_auth_subject(token),
+        )
+        for token, scopes in resolved_token_map.items()
+    }
+
     repository = RecommenderRepository(database_path=resolved_path)
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         await run_in_threadpool(repository.connect)
         app.state.repository = repository
-        app.state.auth_token_scopes = resolved_token_map
+        app.state.env_token_contexts = env_token_contexts
         app.state.metrics = MetricsStore()
+        app.state.token_cache = TokenAuthCache()
+        app.state.ranking_cache = RankingCache()
+        app.state.http_client = build_http_client()
+        LOGGER.info(
+            json.dumps(
+                {"event": "startup", "event_loop": type(asyncio.get_running_loop()).__name__}
+            )
+        )
         try:
             yield
         finally:
+            await app.state.http_client.aclose()
             await run_in_threadpool(repository.close)
 
     app = FastAPI(title="OperationBattleship Recommender", version="0.6.0", lifespan=lifespan)
 
-    async def write_audit_event(
+    def write_audit_event(
         request: Request,
         *,
         action: str,
@@ -1914,12 +2499,15 @@ def create_app(
         status: str,
         message: str | None = None,
         auth_subject: str | None = None,
-    ) -> int:
+    ) -> str:
         request_id = getattr(request.state, "request_id", None)
         source_ip = request.client.host if request.client else None
         user_agent = request.headers.get("user-agent")
-        return await run_in_threadpool(
-            request.app.state.repository.record_audit_event,
+        # record_audit_event appends to the in-memory buffer and takes its id from a
+        # block the flusher thread reserved ahead of time, so it is safe to call on
+        # the event loop; the flusher does the I/O.
+        # Returned as the header value handlers set on their response.
+        event_id = request.app.state.repository.record_audit_event(
             request_id=request_id,
             method=request.method,
             path=request.url.path,
@@ -1931,10 +2519,62 @@ def create_app(
             status=status,
             message=message,
         )
+        return str(event_id)
+
+    async def scan_sources_concurrently(
+        request: Request,
+        sources: list[JobSource],
+        *,
+        trigger: Literal["manual", "scheduled"],
+        respect_backoff: bool,
+    ) -> list[JobSourceScanResult]:
+        semaphore = asyncio.Semaphore(scan_concurrency)
+        # One timestamp per batch: backoff checks and scan records share it.
+        now = datetime.now(UTC)
+
+        async def scan_one(source: JobSource) -> JobSourceScanResult:
+            async with semaphore:
+                return await scan_source(
+                    request.app.state.repository,
+                    source,
+                    http_client=request.app.state.http_client,
+                    trigger=trigger,
+                    respect_backoff=respect_backoff,
+                    now=now,
+                )
+
+        return list(await asyncio.gather(*(scan_one(source) for source in sources)))
+
+    recommend_context_loads: dict[
+        tuple[str | None, int | None, int], asyncio.Future[RecommendContext]
+    ] = {}
+
+    async def load_recommend_context(
+        request: Request,
+        profile_id: str | None,
+        postings_limit: int | None,
+    ) -> RecommendContext:
+        # Concurrent /recommend calls for the same profile and limit share one read,
+        # but only with loads started since the last committed postings/profile write.
+        repository = request.app.state.repository
+        key = (profile_id, postings_limit, repository.recommend_context_generation)
+        load = recommend_context_loads.get(key)
+        if load is None:
+            load = asyncio.ensure_future(
+                run_in_threadpool(
+                    repository.load_recommend_context,
+                    profile_id,
+                    postings_limit,
+                )
+            )
+            recommend_context_loads[key] = load
+            load.add_done_callback(lambda _: recommend_context_loads.pop(key, None))
+        # Shielded so one cancelled request does not cancel the read for the others.
+        return await asyncio.shield(load)
 
     @app.middleware("http")
     async def observability_middleware(request: Request, call_next):
-        request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
+        request_id = request.headers.get("x-request-id") or secrets.token_hex(16)
         request.state.request_id = request_id
         started = time.perf_counter()
 
@@ -1975,19 +2615,20 @@ def create_app(
             duration_ms=duration_ms,
         )
         response.headers["x-request-id"] = request_id
-        LOGGER.info(
-            json.dumps(
-                {
-                    "event": "request_complete",
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
-                    "duration_ms": round(duration_ms, 3),
-                    "source_ip": request.client.host if request.client else None,
-                }
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info(
+                json.dumps(
+                    {
+                        "event": "request_complete",
+                        "request_id": request_id,
+                        "method": request.method,
+                        "path": request.url.path,
+                        "status_code": response.status_code,
+                        "duration_ms": round(duration_ms, 3),
+                        "source_ip": request.client.host if request.client else None,
+                    }
+                )
             )
-        )
         return response
 
     async def require_scope(
@@ -1996,15 +2637,22 @@ def create_app(
         action: str,
         scope: str,
     ) -> str | None:
-        token_map: dict[str, set[str]] = request.app.state.auth_token_scopes
+        env_contexts: dict[str, TokenAuthContext] = request.app.state.env_token_contexts
+        token_cache: TokenAuthCache = request.app.state.token_cache
         provided = request.headers.get("x-api-key", "")
-        has_env_tokens = bool(token_map)
-        has_db_tokens = await run_in_threadpool(request.app.state.repository.has_active_api_tokens)
-        auth_configured = has_env_tokens or has_db_tokens
+        auth_configured = bool(env_contexts)
+        if not auth_configured:
+            has_db_tokens = token_cache.get_has_active_tokens()
+            if has_db_tokens is None:
+                has_db_tokens = await run_in_threadpool(
+                    request.app.state.repository.has_active_api_tokens
+                )
+                token_cache.store_has_active_tokens(has_db_tokens)
+            auth_configured = has_db_tokens
         if not auth_configured:
             return None
         if not provided:
-            await write_audit_event(
+            write_audit_event(
                 request,
                 action=action,
                 scope=scope,
@@ -2013,21 +2661,31 @@ def create_app(
             )
             raise HTTPException(status_code=401, detail="Unauthorized")
 
-        token_context: TokenAuthContext | None = None
-        env_scopes = token_map.get(provided)
-        if env_scopes is not None:
-            token_context = TokenAuthContext(
-                scopes=env_scopes,
-                auth_subject=build_auth_subject(provided),
-            )
-        else:
-            token_context = await run_in_threadpool(
-                request.app.state.repository.resolve_db_token,
-                provided,
+        provided_hash = hash_token(provided)
+        token_context = env_contexts.get(provided_hash)
+        if token_context is None:
+            token_context = token_cache.get_context(provided_hash)
+            if token_context is None:
+                token_context = await run_in_threadpool(
+                    request.app.state.repository.resolve_db_token,
+                    provided_hash,
+                )
+                if token_context is not None:
+                    token_cache.store_context(provided_hash, token_context)
+
+        if token_context is not None and token_context.token_id:
+            still_active = await run_in_threadpool(
+                request.app.state.repository.touch_api_token_usage,
+                token_context.token_id,
+                source_ip=request.client.host if request.client else None,
+                user_agent=request.headers.get("user-agent"),
             )
+            if not still_active:
+                token_cache.discard_context(provided_hash)
+                token_context = None
 
         if token_context is None:
-            await write_audit_event(
+            write_audit_event(
                 request,
                 action=action,
                 scope=scope,
@@ -2036,18 +2694,10 @@ def create_app(
             )
             raise HTTPException(status_code=401, detail="Unauthorized")
 
-        if token_context.token_id:
-            await run_in_threadpool(
-                request.app.state.repository.touch_api_token_usage,
-                token_context.token_id,
-                source_ip=request.client.host if request.client else None,
-                user_agent=request.headers.get("user-agent"),
-            )
-
         auth_subject = token_context.auth_subject
         scopes = token_context.scopes
         if "*" not in scopes and scope not in scopes:
-            await write_audit_event(
+            write_audit_event(
                 request,
                 action=action,
                 scope=scope,
@@ -2081,7 +2731,7 @@ def create_app(
             request.app.state.repository.upsert_postings,
             payload.postings,
         )
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="postings_upsert",
             scope="postings:write",
@@ -2089,7 +2739,7 @@ def create_app(
             message=f"updated={updated}",
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return UpsertPostingsResponse(updated=updated)
 
     @app.get("/postings", response_model=list[StoredPosting])
@@ -2111,7 +2761,7 @@ def create_app(
             scope="sources:write",
         )
         source = await run_in_threadpool(request.app.state.repository.upsert_job_source, payload)
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="job_source_upsert",
             scope="sources:write",
@@ -2119,7 +2769,7 @@ def create_app(
             message=f"source_id={source.source_id}",
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return source
 
     @app.get("/job-sources", response_model=list[JobSource])
@@ -2143,7 +2793,7 @@ def create_app(
         )
         source = await run_in_threadpool(request.app.state.repository.get_job_source, source_id)
         if source is None:
-            event_id = await write_audit_event(
+            event_id = write_audit_event(
                 request,
                 action="job_source_scan_one",
                 scope="scan",
@@ -2151,18 +2801,18 @@ def create_app(
                 message=f"source_id={source_id}",
                 auth_subject=auth_subject,
             )
-            response.headers["x-audit-event-id"] = str(event_id)
+            response.headers["x-audit-event-id"] = event_id
             raise HTTPException(status_code=404, detail="Unknown source_id")
 
-        result = await run_in_threadpool(
-            scan_source,
+        result = await scan_source(
             request.app.state.repository,
             source,
+            http_client=request.app.state.http_client,
             trigger="manual",
             respect_backoff=respect_backoff,
         )
         if result.status == "error":
-            event_id = await write_audit_event(
+            event_id = write_audit_event(
                 request,
                 action="job_source_scan_one",
                 scope="scan",
@@ -2170,12 +2820,12 @@ def create_app(
                 message=f"source_id={source_id}; error={result.error}",
                 auth_subject=auth_subject,
             )
-            response.headers["x-audit-event-id"] = str(event_id)
+            response.headers["x-audit-event-id"] = event_id
             raise HTTPException(
                 status_code=502,
                 detail={"source_id": result.source_id, "error": result.error},
             )
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="job_source_scan_one",
             scope="scan",
@@ -2186,7 +2836,7 @@ def create_app(
             ),
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return result
 
     @app.post("/job-sources/scan", response_model=JobSourceScanBatchResponse)
@@ -2207,30 +2857,15 @@ def create_app(
             respect_backoff=False,
             now_iso=now_utc_iso(),
         )
-        results: list[JobSourceScanResult] = []
-        for source in sources:
-            result = await run_in_threadpool(
-                scan_source,
-                request.app.state.repository,
-                source,
-                trigger="manual",
-                respect_backoff=respect_backoff,
-            )
-            results.append(result)
-
-        batch = JobSourceScanBatchResponse(
-            scanned_at=now_utc_iso(),
+        results = await scan_sources_concurrently(
+            request,
+            sources,
             trigger="manual",
             respect_backoff=respect_backoff,
-            requested_sources=len(sources),
-            successful_sources=sum(1 for result in results if result.status == "ok"),
-            failed_sources=sum(1 for result in results if result.status == "error"),
-            skipped_sources=sum(1 for result in results if result.status == "skipped"),
-            total_ingested=sum(result.ingested for result in results),
-            possible_duplicates=sum(result.possible_duplicates for result in results),
-            results=results,
         )
-        event_id = await write_audit_event(
+
+        batch = summarize_scan_results(results, trigger="manual", respect_backoff=respect_backoff)
+        event_id = write_audit_event(
             request,
             action="job_source_scan_all",
             scope="scan",
@@ -2242,7 +2877,7 @@ def create_app(
             ),
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return batch
 
     @app.post("/job-sources/scan/scheduled", response_model=JobSourceScanBatchResponse)
@@ -2262,30 +2897,15 @@ def create_app(
             respect_backoff=False,
             now_iso=now_utc_iso(),
         )
-        results: list[JobSourceScanResult] = []
-        for source in sources:
-            result = await run_in_threadpool(
-                scan_source,
-                request.app.state.repository,
-                source,
-                trigger="scheduled",
-                respect_backoff=True,
-            )
-            results.append(result)
-
-        batch = JobSourceScanBatchResponse(
-            scanned_at=now_utc_iso(),
+        results = await scan_sources_concurrently(
+            request,
+            sources,
             trigger="scheduled",
             respect_backoff=True,
-            requested_sources=len(sources),
-            successful_sources=sum(1 for result in results if result.status == "ok"),
-            failed_sources=sum(1 for result in results if result.status == "error"),
-            skipped_sources=sum(1 for result in results if result.status == "skipped"),
-            total_ingested=sum(result.ingested for result in results),
-            possible_duplicates=sum(result.possible_duplicates for result in results),
-            results=results,
         )
-        event_id = await write_audit_event(
+
+        batch = summarize_scan_results(results, trigger="scheduled", respect_backoff=True)
+        event_id = write_audit_event(
             request,
             action="job_source_scan_scheduled",
             scope="scan",
@@ -2297,7 +2917,7 @@ def create_app(
             ),
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return batch
 
     @app.get("/job-sources/scan-history", response_model=list[JobSourceScanHistoryItem])
@@ -2331,7 +2951,7 @@ def create_app(
             scanned_after=scanned_after,
             scanned_before=scanned_before,
         )
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="job_source_scan_history",
             scope="scan",
@@ -2343,7 +2963,7 @@ def create_app(
             ),
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return history
 
     @app.post("/profiles", response_model=UserPreferenceProfile)
@@ -2358,7 +2978,7 @@ def create_app(
             scope="profiles:write",
         )
         profile = await run_in_threadpool(request.app.state.repository.upsert_user_profile, payload)
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="profile_upsert",
             scope="profiles:write",
@@ -2366,7 +2986,7 @@ def create_app(
             message=f"profile_id={profile.profile_id}",
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return profile
 
     @app.get("/profiles", response_model=list[UserPreferenceProfile])
@@ -2396,7 +3016,7 @@ def create_app(
             profile_id,
         )
         if not deleted:
-            event_id = await write_audit_event(
+            event_id = write_audit_event(
                 request,
                 action="profile_delete",
                 scope="profiles:write",
@@ -2404,9 +3024,9 @@ def create_app(
                 message=f"profile_id={profile_id}",
                 auth_subject=auth_subject,
             )
-            response.headers["x-audit-event-id"] = str(event_id)
+            response.headers["x-audit-event-id"] = event_id
             raise HTTPException(status_code=404, detail="Unknown profile_id")
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="profile_delete",
             scope="profiles:write",
@@ -2414,7 +3034,7 @@ def create_app(
             message=f"profile_id={profile_id}",
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return {"deleted": True}
 
     @app.post("/auth/tokens", response_model=ApiTokenCreateResponse)
@@ -2429,7 +3049,8 @@ def create_app(
             scope="tokens:write",
         )
         token = await run_in_threadpool(request.app.state.repository.create_api_token, payload)
-        event_id = await write_audit_event(
+        request.app.state.token_cache.clear()
+        event_id = write_audit_event(
             request,
             action="token_create",
             scope="tokens:write",
@@ -2437,7 +3058,7 @@ def create_app(
             message=f"token_id={token.metadata.token_id}; scopes={','.join(token.metadata.scopes)}",
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return token
 
     @app.get("/auth/tokens", response_model=list[ApiTokenMetadata])
@@ -2455,7 +3076,7 @@ def create_app(
             request.app.state.repository.list_api_tokens,
             include_revoked=include_revoked,
         )
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="token_list",
             scope="tokens:read",
@@ -2463,7 +3084,7 @@ def create_app(
             message=f"returned={len(tokens)}",
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return tokens
 
     @app.post("/auth/tokens/{token_id}/revoke")
@@ -2478,8 +3099,9 @@ def create_app(
             scope="tokens:write",
         )
         revoked = await run_in_threadpool(request.app.state.repository.revoke_api_token, token_id)
+        request.app.state.token_cache.clear()
         if not revoked:
-            event_id = await write_audit_event(
+            event_id = write_audit_event(
                 request,
                 action="token_revoke",
                 scope="tokens:write",
@@ -2487,9 +3109,9 @@ def create_app(
                 message=f"token_id={token_id}",
                 auth_subject=auth_subject,
             )
-            response.headers["x-audit-event-id"] = str(event_id)
+            response.headers["x-audit-event-id"] = event_id
             raise HTTPException(status_code=404, detail="Unknown token_id")
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="token_revoke",
             scope="tokens:write",
@@ -2497,7 +3119,7 @@ def create_app(
             message=f"token_id={token_id}",
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return {"revoked": True}
 
     @app.get("/audit-events", response_model=list[AuditEvent])
@@ -2519,7 +3141,7 @@ def create_app(
             action=action,
             status=status,
         )
-        event_id = await write_audit_event(
+        event_id = write_audit_event(
             request,
             action="audit_events_list",
             scope="audit:read",
@@ -2527,7 +3149,7 @@ def create_app(
             message=f"returned={len(events)}",
             auth_subject=auth_subject,
         )
-        response.headers["x-audit-event-id"] = str(event_id)
+        response.headers["x-audit-event-id"] = event_id
         return events
 
     @app.get("/recommendations/history", response_model=RecommendationHistoryResponse)
@@ -2541,38 +3163,21 @@ def create_app(
     @app.post("/recommend", response_model=RecommendResponse)
     async def recommend(payload: RecommendRequest, request: Request) -> RecommendResponse:
         source: Literal["payload", "stored"] = "payload"
+        postings = payload.postings
         profile: UserPreferenceProfile | None = None
-        if payload.profile_id:
-            profile = await run_in_threadpool(
-                request.app.state.repository.get_user_profile,
+        stored_postings: list[StoredPosting] = []
+        if payload.profile_id or not postings:
+            profile, stored_postings = await load_recommend_context(
+                request,
                 payload.profile_id,
+                None if postings else payload.max_postings,
             )
-            if profile is None:
+            if payload.profile_id and profile is None:
                 raise HTTPException(status_code=404, detail="Unknown profile_id")
 
-        postings = payload.postings
         if not postings:
             source = "stored"
-            stored_postings = await run_in_threadpool(
-                request.app.state.repository.list_postings,
-                payload.max_postings,
-            )
-            postings = [
-                JobPosting(
-                    id=posting.id,
-                    title=posting.title,
-                    description=posting.description,
-                    company=posting.company,
-                    location=posting.location,
-                    apply_url=posting.apply_url,
-                    source_id=posting.source_id,
-                    external_id=posting.external_id,
-                    dedup_key=posting.dedup_key,
-                    duplicate_hint_count=posting.duplicate_hint_count,
-                    updated_at=posting.updated_at,
-                )
-                for posting in stored_postings
-            ]
+            postings = stored_postings
         else:
             await run_in_threadpool(request.app.state.repository.upsert_postings, postings)
 
@@ -2580,16 +3185,43 @@ def create_app(
             resolve_recommendation_preferences(payload, profile)
         )
 
-        ranked = rank_postings(
-            payload.resume_text,
-            postings,
-            preferred_keywords=preferred_keywords,
-            preferred_locations=preferred_locations,
-            preferred_companies=preferred_companies,
-            remote_only=remote_only,
-        )
-        run_id, generated_at = await run_in_threadpool(
-            request.app.state.repository.record_recommendations,
+        # Re-polls against unchanged stored postings reuse the ranking; any upsert
+        # bumps updated_at and so changes the key. A run is still recorded per call.
+        ranking_key: tuple[Any, ...] | None = None
+        ranked: list[RankedRecommendation] | None = None
+        if source == "stored":
+            ranking_key = (
+                payload.resume_text,
+                tuple(preferred_keywords),
+                tuple(preferred_locations),
+                tuple(preferred_companies),
+                remote_only,
+                payload.top_k,
+                tuple((posting.id, posting.updated_at) for posting in postings),
+            )
+            ranked = request.app.state.ranking_cache.get(ranking_key)
+
+        if ranked is None:
+            rank = partial(
+                rank_postings,
+                payload.resume_text,
+                postings,
+                preferred_keywords=preferred_keywords,
+                preferred_locations=preferred_locations,
+                preferred_companies=preferred_companies,
+                remote_only=remote_only,
+                top_k=payload.top_k,
+            )
+            # Small lists rank faster inline than the threadpool hop costs; larger ones
+            # would hold the event loop for the whole scoring pass.
+            if len(postings) >= RANK_IN_THREADPOOL_MIN_POSTINGS:
+                ranked = await run_in_threadpool(rank)
+            else:
+                ranked = rank()
+            if ranking_key is not None:
+                request.app.state.ranking_cache.store(ranking_key, ranked)
+        # Buffered like audit events: the run id is assigned now, the rows land later.
+        run_id, generated_at = request.app.state.repository.record_recommendations(
             payload.resume_text,
             ranked,
         )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 
 import pytest
@@ -148,3 +149,105 @@ def test_scan_scheduled_and_history_require_scan_scope(client: TestClient) -> No
     )
     assert history_ok.status_code == 200
     assert history_ok.headers.get("x-audit-event-id")
+
+
+def test_buffered_audit_events_persist_across_restart(tmp_path: Path) -> None:
+    db_path = tmp_path / "restart.sqlite3"
+    tokens = {"token-admin": {"*"}}
+    posting = {"id": "job-1", "title": "Backend Engineer", "description": "Build Python APIs"}
+
+    with TestClient(create_app(database_path=str(db_path), api_tokens=tokens)) as client:
+        first = client.post(
+            "/postings",
+            headers={"x-api-key": "token-admin"},
+            json={"postings": [posting]},
+        )
+        assert first.status_code == 200
+        first_event_id = int(first.headers["x-audit-event-id"])
+
+    with TestClient(create_app(database_path=str(db_path), api_tokens=tokens)) as client:
+        second = client.post(
+            "/postings",
+            headers={"x-api-key": "token-admin"},
+            json={"postings": [posting]},
+        )
+        assert second.status_code == 200
+        assert int(second.headers["x-audit-event-id"]) > first_event_id
+
+        events = client.get(
+            "/audit-events?action=postings_upsert",
+            headers={"x-api-key": "token-admin"},
+        ).json()
+        event_ids = {event["event_id"] for event in events}
+        assert first_event_id in event_ids
+        assert int(second.headers["x-audit-event-id"]) in event_ids
+
+
+def test_audit_event_ids_stay_unique_across_processes_sharing_a_database(
+    tmp_path: Path,
+) -> None:
+    db_path = str(tmp_path / "shared.sqlite3")
+    tokens = {"token-admin": {"*"}}
+    posting = {"id": "job-1", "title": "Backend Engineer", "description": "Build Python APIs"}
+
+    with (
+        TestClient(create_app(database_path=db_path, api_tokens=tokens)) as first,
+        TestClient(create_app(database_path=db_path, api_tokens=tokens)) as second,
+    ):
+        event_ids = []
+        for client in (first, second, first, second):
+            response = client.post(
+                "/postings",
+                headers={"x-api-key": "token-admin"},
+                json={"postings": [posting]},
+            )
+            assert response.status_code == 200
+            event_ids.append(int(response.headers["x-audit-event-id"]))
+        assert len(set(event_ids)) == len(event_ids)
+
+        for client in (first, second):
+            events_response = client.get(
+                "/audit-events?action=postings_upsert",
+                headers={"x-api-key": "token-admin"},
+            )
+            assert events_response.status_code == 200
+        persisted = {event["event_id"] for event in events_response.json()}
+        assert set(event_ids) <= persisted
+
+
+def test_audit_event_id_conflict_does_not_block_later_flushes(tmp_path: Path) -> None:
+    db_path = tmp_path / "conflict.sqlite3"
+    tokens = {"token-admin": {"*"}}
+    posting = {"id": "job-1", "title": "Backend Engineer", "description": "Build Python APIs"}
+
+    with TestClient(create_app(database_path=str(db_path), api_tokens=tokens)) as client:
+        first = client.post(
+            "/postings",
+            headers={"x-api-key": "token-admin"},
+            json={"postings": [posting]},
+        )
+        conflicting_id = int(first.headers["x-audit-event-id"]) + 1
+        # A writer that ignores id reservations takes the id the next event will get.
+        with sqlite3.connect(db_path) as connection:
+            connection.execute(
+                """
+                INSERT INTO audit_events (id, occurred_at, method, path, action, status)
+                VALUES (?, '2026-01-01T00:00:00+00:00', 'POST', '/external', 'external', 'ok')
+                """,
+                (conflicting_id,),
+            )
+
+        second = client.post(
+            "/postings",
+            headers={"x-api-key": "token-admin"},
+            json={"postings": [posting]},
+        )
+        assert int(second.headers["x-audit-event-id"]) == conflicting_id
+
+        for _ in range(2):
+            events_response = client.get(
+                "/audit-events?action=postings_upsert",
+                headers={"x-api-key": "token-admin"},
+            )
+            assert events_response.status_code == 200
+            assert len(events_response.json()) == 2
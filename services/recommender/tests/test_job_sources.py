@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from recommender.main import create_app
+from recommender.main import build_http_client, create_app
 
 pytestmark = pytest.mark.integration
 
@@ -18,6 +18,24 @@ def client(tmp_path: Path):
         yield test_client
 
 
+@pytest.fixture
+def mock_http(client: TestClient):
+    original = client.app.state.http_client
+    installed: list[httpx.AsyncClient] = []
+
+    def install(handler) -> None:
+        mock_client = build_http_client(transport=httpx.MockTransport(handler))
+        installed.append(mock_client)
+        client.app.state.http_client = mock_client
+
+    yield install
+
+    for mock_client in installed:
+        client.portal.call(mock_client.aclose)
+    # The lifespan closes whatever client is installed at shutdown.
+    client.app.state.http_client = original
+
+
 def test_inline_job_source_scan_persists_postings(client: TestClient) -> None:
     source_response = client.post(
         "/job-sources",
@@ -54,28 +72,14 @@ def test_inline_job_source_scan_persists_postings(client: TestClient) -> None:
     assert body["recommendations"][0]["title"] == "Backend Engineer"
 
 
-def test_json_url_source_scan_fetches_remote_payload(
-    client: TestClient,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
+def test_json_url_source_scan_fetches_remote_payload(client: TestClient, mock_http) -> None:
     payload = {"postings": [{"title": "Platform Engineer", "description": "Own CI tooling"}]}
 
-    class FakeResponse:
-        def __enter__(self) -> FakeResponse:
-            return self
-
-        def __exit__(self, *_: object) -> bool:
-            return False
-
-        def read(self) -> bytes:
-            return json.dumps(payload).encode("utf-8")
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert str(request.url) == "https://example.com/postings.json"
+        return httpx.Response(200, json=payload)
 
-    def fake_urlopen(url: str, timeout: int = 15) -> FakeResponse:
-        del timeout
-        assert url == "https://example.com/postings.json"
-        return FakeResponse()
-
-    monkeypatch.setattr("recommender.main.urllib_request.urlopen", fake_urlopen)
+    mock_http(handler)
 
     source_response = client.post(
         "/job-sources",
@@ -96,6 +100,36 @@ def test_json_url_source_scan_fetches_remote_payload(
     assert body["ingested"] == 1
 
 
+def test_json_url_source_scan_follows_redirects(client: TestClient, mock_http) -> None:
+    payload = {"postings": [{"title": "Platform Engineer", "description": "Own CI tooling"}]}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == "http://example.com/postings.json":
+            return httpx.Response(302, headers={"location": "https://example.com/postings.json"})
+        assert str(request.url) == "https://example.com/postings.json"
+        return httpx.Response(200, json=payload)
+
+    mock_http(handler)
+
+    source_response = client.post(
+        "/job-sources",
+        json={
+            "source_id": "redirect_demo",
+            "name": "Redirect Demo",
+            "source_type": "json_url",
+            "url": "http://example.com/postings.json",
+            "enabled": True,
+        },
+    )
+    assert source_response.status_code == 200
+
+    scan_response = client.post("/job-sources/redirect_demo/scan")
+    assert scan_response.status_code == 200
+    body = scan_response.json()
+    assert body["status"] == "ok"
+    assert body["ingested"] == 1
+
+
 def test_light_dedup_keeps_duplicates_without_external_ids(client: TestClient) -> None:
     source_response = client.post(
         "/job-sources",
@@ -174,6 +208,34 @@ def test_external_id_dedup_updates_single_record(client: TestClient) -> None:
     assert postings[0]["description"] == "Build APIs v2"
 
 
+def test_repeated_external_id_in_payload_keeps_last_occurrence(client: TestClient) -> None:
+    source_response = client.post(
+        "/job-sources",
+        json={
+            "source_id": "repeated_external",
+            "name": "Repeated External IDs",
+            "source_type": "inline_json",
+            "postings": [
+                {"external_id": "abc-1", "title": "Backend Engineer", "description": "Old"},
+                {"external_id": "abc-1", "title": "Backend Engineer", "description": "New"},
+            ],
+            "enabled": True,
+        },
+    )
+    assert source_response.status_code == 200
+
+    scan_response = client.post("/job-sources/repeated_external/scan")
+    assert scan_response.status_code == 200
+    assert scan_response.json()["ingested"] == 1
+
+    postings_response = client.get("/postings?limit=20")
+    postings = [
+        item for item in postings_response.json() if item["source_id"] == "repeated_external"
+    ]
+    assert len(postings) == 1
+    assert postings[0]["description"] == "New"
+
+
 def test_write_endpoints_require_api_key_when_configured(tmp_path: Path) -> None:
     db_path = tmp_path / "secured.sqlite3"
     app = create_app(database_path=str(db_path), api_key="secret-key")
@@ -201,26 +263,12 @@ def test_write_endpoints_require_api_key_when_configured(tmp_path: Path) -> None
         assert allowed.json() == {"updated": 1}
 
 
-def test_scan_backoff_skip_and_history(
-    client: TestClient,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    class FailingResponse:
-        def __enter__(self) -> FailingResponse:
-            return self
-
-        def __exit__(self, *_: object) -> bool:
-            return False
-
-        def read(self) -> bytes:
-            raise RuntimeError("upstream unavailable")
+def test_scan_backoff_skip_and_history(client: TestClient, mock_http) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert str(request.url) == "https://example.com/failing.json"
+        raise RuntimeError("upstream unavailable")
 
-    def failing_urlopen(url: str, timeout: int = 15) -> FailingResponse:
-        del timeout
-        assert url == "https://example.com/failing.json"
-        return FailingResponse()
-
-    monkeypatch.setattr("recommender.main.urllib_request.urlopen", failing_urlopen)
+    mock_http(handler)
 
     source_response = client.post(
         "/job-sources",
@@ -334,3 +382,26 @@ def test_scan_history_supports_status_date_and_pagination(client: TestClient) ->
 def test_scan_history_rejects_invalid_timestamps(client: TestClient) -> None:
     response = client.get("/job-sources/scan-history?scanned_after=not-a-timestamp")
     assert response.status_code == 422
+
+
+def test_batch_scan_covers_every_source_in_order(client: TestClient) -> None:
+    for source_id, title in (("batch_b", "Data Engineer"), ("batch_a", "Backend Engineer")):
+        source_response = client.post(
+            "/job-sources",
+            json={
+                "source_id": source_id,
+                "name": source_id,
+                "source_type": "inline_json",
+                "postings": [{"title": title, "description": "Build data and API products"}],
+                "enabled": True,
+            },
+        )
+        assert source_response.status_code == 200
+
+    scan_response = client.post("/job-sources/scan")
+    assert scan_response.status_code == 200
+    body = scan_response.json()
+    assert body["requested_sources"] == 2
+    assert body["successful_sources"] == 2
+    assert body["total_ingested"] == 2
+    assert [result["source_id"] for result in body["results"]] == ["batch_a", "batch_b"]
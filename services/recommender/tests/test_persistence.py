@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sqlite3
+import threading
 from pathlib import Path
 
 import pytest
@@ -72,3 +74,233 @@ def test_recommendation_history_tracks_runs(client: TestClient) -> None:
     runs = history_response.json()["runs"]
     assert len(runs) == 1
     assert runs[0]["recommendation_count"] == 1
+
+
+def test_stored_postings_reflect_upserts_after_a_read(client: TestClient) -> None:
+    first = {"id": "job-1", "title": "Backend Engineer", "description": "Build Python APIs"}
+    client.post("/postings", json={"postings": [first]})
+    assert [item["id"] for item in client.get("/postings?limit=10").json()] == ["job-1"]
+
+    updated = {**first, "description": "Build Python APIs and CI tooling"}
+    second = {"id": "job-2", "title": "Data Scientist", "description": "Train ML models"}
+    client.post("/postings", json={"postings": [updated, second]})
+
+    postings = {item["id"]: item for item in client.get("/postings?limit=10").json()}
+    assert set(postings) == {"job-1", "job-2"}
+    assert postings["job-1"]["description"] == "Build Python APIs and CI tooling"
+
+
+def test_recommendation_runs_persist_across_restart(tmp_path: Path) -> None:
+    db_path = tmp_path / "restart.sqlite3"
+    payload = {
+        "resume_text": "Backend engineer focused on Python APIs and platform tooling.",
+        "postings": [{"id": "job-1", "title": "Backend Engineer", "description": "Python APIs"}],
+    }
+
+    with TestClient(create_app(database_path=str(db_path))) as client:
+        first_run_id = client.post("/recommend", json=payload).json()["run_id"]
+
+    with TestClient(create_app(database_path=str(db_path))) as client:
+        second_run_id = client.post("/recommend", json=payload).json()["run_id"]
+        assert second_run_id > first_run_id
+
+        runs = client.get("/recommendations/history").json()["runs"]
+        assert [run["run_id"] for run in runs] == [second_run_id, first_run_id]
+        assert all(run["recommendation_count"] == 1 for run in runs)
+
+
+def test_recommendation_run_ids_stay_unique_across_processes_sharing_a_database(
+    tmp_path: Path,
+) -> None:
+    db_path = str(tmp_path / "shared.sqlite3")
+    payload = {
+        "resume_text": "Backend engineer focused on Python APIs and platform tooling.",
+        "postings": [{"id": "job-1", "title": "Backend Engineer", "description": "Python APIs"}],
+    }
+
+    with (
+        TestClient(create_app(database_path=db_path)) as first,
+        TestClient(create_app(database_path=db_path)) as second,
+    ):
+        run_ids = [
+            client.post("/recommend", json=payload).json()["run_id"]
+            for client in (first, second, first, second)
+        ]
+        assert len(set(run_ids)) == len(run_ids)
+
+        for client in (first, second):
+            history_response = client.get("/recommendations/history")
+            assert history_response.status_code == 200
+        runs = history_response.json()["runs"]
+        assert {run["run_id"] for run in runs} == set(run_ids)
+        assert all(run["recommendation_count"] == 1 for run in runs)
+
+
+def test_recommendation_run_id_conflict_does_not_block_later_flushes(tmp_path: Path) -> None:
+    db_path = tmp_path / "conflict.sqlite3"
+    payload = {
+        "resume_text": "Backend engineer focused on Python APIs and platform tooling.",
+        "postings": [{"id": "job-1", "title": "Backend Engineer", "description": "Python APIs"}],
+    }
+
+    with TestClient(create_app(database_path=str(db_path))) as client:
+        first_run_id = client.post("/recommend", json=payload).json()["run_id"]
+        # A writer that ignores id reservations takes the id the next run will get.
+        with sqlite3.connect(db_path) as connection:
+            connection.execute(
+                """
+                INSERT INTO recommendation_runs (id, resume_text, generated_at)
+                VALUES (?, 'external', '2026-01-01T00:00:00+00:00')
+                """,
+                (first_run_id + 1,),
+            )
+
+        assert client.post("/recommend", json=payload).json()["run_id"] == first_run_id + 1
+
+        for _ in range(2):
+            history_response = client.get("/recommendations/history")
+            assert history_response.status_code == 200
+            runs = history_response.json()["runs"]
+            assert sorted(run["recommendation_count"] for run in runs) == [0, 1, 1]
+
+
+def test_in_memory_database_serves_reads_from_the_same_database(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    with TestClient(create_app(database_path=":memory:")) as client:
+        store_response = client.post(
+            "/postings",
+            json={
+                "postings": [{"id": "job-1", "title": "Backend Engineer", "description": "APIs"}]
+            },
+        )
+        assert store_response.status_code == 200
+
+        postings = client.get("/postings").json()
+        assert [posting["id"] for posting in postings] == ["job-1"]
+
+    assert not (tmp_path / ":memory:").exists()
+
+
+def test_recommendation_counts_are_backfilled_for_existing_databases(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.sqlite3"
+    connection = sqlite3.connect(db_path)
+    connection.executescript(
+        """
+        CREATE TABLE recommendation_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_text TEXT NOT NULL,
+            generated_at TEXT NOT NULL
+        );
+        CREATE TABLE recommendation_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL REFERENCES recommendation_runs(id) ON DELETE CASCADE,
+            job_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            score REAL NOT NULL,
+            rank INTEGER NOT NULL
+        );
+        INSERT INTO recommendation_runs (resume_text, generated_at)
+        VALUES ('Python engineer', '2025-01-01T00:00:00+00:00');
+        INSERT INTO recommendation_items (run_id, job_id, title, score, rank)
+        VALUES (1, 'job-1', 'Backend Engineer', 0.5, 1), (1, 'job-2', 'ML Engineer', 0.4, 2);
+        """
+    )
+    connection.close()
+
+    with TestClient(create_app(database_path=str(db_path))) as client:
+        runs = client.get("/recommendations/history").json()["runs"]
+        assert [(run["run_id"], run["recommendation_count"]) for run in runs] == [(1, 2)]
+
+
+def test_repeated_stored_recommend_records_runs_and_sees_new_postings(
+    client: TestClient,
+) -> None:
+    resume = "Backend engineer focused on Python APIs and platform tooling."
+    client.post(
+        "/postings",
+        json={"postings": [{"id": "job-1", "title": "Data Scientist", "description": "ML"}]},
+    )
+
+    first = client.post("/recommend", json={"resume_text": resume, "postings": []}).json()
+    second = client.post("/recommend", json={"resume_text": resume, "postings": []}).json()
+    assert second["run_id"] > first["run_id"]
+    assert second["recommendations"] == first["recommendations"]
+
+    client.post(
+        "/postings",
+        json={
+            "postings": [
+                {"id": "job-2", "title": "Backend Engineer", "description": "Python APIs"}
+            ]
+        },
+    )
+    third = client.post("/recommend", json={"resume_text": resume, "postings": []}).json()
+    assert third["recommendations"][0]["id"] == "job-2"
+
+    runs = client.get("/recommendations/history").json()["runs"]
+    assert len(runs) == 3
+
+
+def test_recommend_after_a_write_does_not_join_an_earlier_context_load(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repository = client.app.state.repository
+    original_load = repository.load_recommend_context
+    first_load_read = threading.Event()
+    release_first_load = threading.Event()
+    calls = 0
+
+    def slow_first_load(profile_id, postings_limit):
+        nonlocal calls
+        calls += 1
+        context = original_load(profile_id, postings_limit)
+        if calls == 1:
+            first_load_read.set()
+            release_first_load.wait(timeout=5)
+        return context
+
+    monkeypatch.setattr(repository, "load_recommend_context", slow_first_load)
+    payload = {
+        "resume_text": "Backend engineer focused on Python APIs and platform tooling.",
+        "postings": [],
+    }
+    assert client.post(
+        "/postings",
+        json={"postings": [{"id": "job-1", "title": "Backend Engineer", "description": "APIs"}]},
+    ).status_code == 200
+
+    first_response: dict = {}
+    first_request = threading.Thread(
+        target=lambda: first_response.update(client.post("/recommend", json=payload).json())
+    )
+    first_request.start()
+    try:
+        assert first_load_read.wait(timeout=5)
+        assert client.post(
+            "/postings",
+            json={"postings": [{"id": "job-2", "title": "Data Engineer", "description": "ETL"}]},
+        ).status_code == 200
+
+        second = client.post("/recommend", json=payload).json()
+        assert {item["id"] for item in second["recommendations"]} == {"job-1", "job-2"}
+    finally:
+        release_first_load.set()
+        first_request.join(timeout=5)
+    assert [item["id"] for item in first_response["recommendations"]] == ["job-1"]
+
+
+def test_pooled_readers_use_the_writer_cache_settings(client: TestClient) -> None:
+    repository = client.app.state.repository
+    pragmas = ("cache_size", "mmap_size", "temp_store")
+    writer_settings = [
+        repository.connection.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in pragmas
+    ]
+    with repository._reader() as connection:
+        reader_settings = [
+            connection.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in pragmas
+        ]
+    assert reader_settings == writer_settings == [-65536, 268435456, 2]
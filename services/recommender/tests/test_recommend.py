@@ -81,3 +81,33 @@ def test_recommend_applies_preferences_and_returns_score_breakdown() -> None:
     assert body["recommendations"][0]["id"] == "job-1"
     assert "score_breakdown" in body["recommendations"][0]
     assert body["recommendations"][0]["score_breakdown"]["preference_bonus"] > 0
+
+
+def test_recommend_top_k_limits_ranked_results() -> None:
+    payload = {
+        "resume_text": "Experienced backend python developer building API systems and tooling.",
+        "top_k": 2,
+        "postings": [
+            {
+                "id": "job-1",
+                "title": "Backend Engineer",
+                "description": "Build Python API services",
+            },
+            {
+                "id": "job-2",
+                "title": "Data Scientist",
+                "description": "Train machine learning models",
+            },
+            {
+                "id": "job-3",
+                "title": "Platform Engineer",
+                "description": "Own developer tooling and CI pipelines",
+            },
+        ],
+    }
+
+    with TestClient(app) as client:
+        response = client.post("/recommend", json=payload)
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["recommendations"]] == ["job-1", "job-3"]
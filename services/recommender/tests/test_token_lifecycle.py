@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import sqlite3
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
-from recommender.main import create_app
+from recommender.main import TokenAuthCache, TokenAuthContext, create_app
 
 pytestmark = pytest.mark.integration
 
@@ -72,3 +74,88 @@ def test_hybrid_token_lifecycle_create_use_revoke(client: TestClient) -> None:
         },
     )
     assert rejected_after_revoke.status_code == 401
+
+
+def test_token_metadata_reports_active_flag(client: TestClient) -> None:
+    create_response = client.post(
+        "/auth/tokens",
+        headers={"x-api-key": "bootstrap-key"},
+        json={"name": "reader", "scopes": ["audit:read"]},
+    )
+    assert create_response.status_code == 200
+    metadata = create_response.json()["metadata"]
+    assert metadata["active"] is True
+
+    revoke_response = client.post(
+        f"/auth/tokens/{metadata['token_id']}/revoke",
+        headers={"x-api-key": "bootstrap-key"},
+    )
+    assert revoke_response.status_code == 200
+
+    tokens = client.get(
+        "/auth/tokens?include_revoked=true",
+        headers={"x-api-key": "bootstrap-key"},
+    ).json()
+    revoked = next(token for token in tokens if token["token_id"] == metadata["token_id"])
+    assert revoked["active"] is False
+    assert revoked["revoked_at"]
+
+
+def _issue_token(client: TestClient) -> tuple[str, str]:
+    create_response = client.post(
+        "/auth/tokens",
+        headers={"x-api-key": "bootstrap-key"},
+        json={"name": "auditor", "scopes": ["audit:read"], "expires_in_days": 1},
+    )
+    assert create_response.status_code == 200
+    body = create_response.json()
+    return body["token"], body["metadata"]["token_id"]
+
+
+def _update_token_in_sqlite(client: TestClient, token_id: str, column: str, value: str) -> None:
+    connection = sqlite3.connect(client.app.state.repository.database_path)
+    connection.execute(f"UPDATE api_tokens SET {column} = ? WHERE token_id = ?", (value, token_id))
+    connection.commit()
+    connection.close()
+
+
+def test_token_expired_after_caching_is_rejected(client: TestClient) -> None:
+    token, token_id = _issue_token(client)
+    assert client.get("/audit-events", headers={"x-api-key": token}).status_code == 200
+
+    expired_at = (datetime.now(UTC) - timedelta(seconds=1)).isoformat()
+    _update_token_in_sqlite(client, token_id, "expires_at", expired_at)
+
+    assert client.get("/audit-events", headers={"x-api-key": token}).status_code == 401
+
+
+def test_token_revoked_directly_in_sqlite_is_rejected(client: TestClient) -> None:
+    token, token_id = _issue_token(client)
+    assert client.get("/audit-events", headers={"x-api-key": token}).status_code == 200
+
+    _update_token_in_sqlite(client, token_id, "revoked_at", datetime.now(UTC).isoformat())
+
+    assert client.get("/audit-events", headers={"x-api-key": token}).status_code == 401
+
+
+def test_token_auth_cache_never_outlives_token_expiry() -> None:
+    cache = TokenAuthCache(ttl_seconds=30.0)
+    now = datetime.now(UTC)
+    expired = TokenAuthContext(
+        scopes={"scan"},
+        auth_subject="db-token:expired",
+        token_id="expired",
+        expires_at=(now - timedelta(seconds=1)).isoformat(),
+    )
+    active = TokenAuthContext(
+        scopes={"scan"},
+        auth_subject="db-token:active",
+        token_id="active",
+        expires_at=(now + timedelta(hours=1)).isoformat(),
+    )
+
+    cache.store_context("expired-hash", expired)
+    cache.store_context("active-hash", active)
+
+    assert cache.get_context("expired-hash") is None
+    assert cache.get_context("active-hash") == active